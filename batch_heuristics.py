@@ -0,0 +1,115 @@
+import math
+from board import *
+
+# NumPy is optional: without it the same functions loop in Python
+try:
+    import numpy
+except ImportError:
+    numpy = None
+
+# the NumPy copies of the misplaced and Manhattan tables of each board size,
+# and the table that maps each character code of a digitstr to its tile
+numpy_tables = {}
+if numpy != None:
+    CHAR_TILES = numpy.full(256, 255, dtype=numpy.uint8)
+    for tile, ch in enumerate(TILE_CHARS):
+        CHAR_TILES[ord(ch)] = tile
+        CHAR_TILES[ord(ch.upper())] = tile
+
+def get_numpy_tables(size):
+    """ returns a tuple of the misplaced and Manhattan tables of the input
+        board size as NumPy arrays indexed by [tile, cell]
+        input size: the number of rows and columns
+    """
+    if size not in numpy_tables:
+        tables = get_tables(size)
+        numpy_tables[size] = (numpy.array(tables.misplaced, dtype=numpy.int32),
+                              numpy.array(tables.manhattan, dtype=numpy.int32))
+    return numpy_tables[size]
+
+def tile_array(boards):
+    """ returns the tiles of the input boards in row-major order, one board
+        per row: a 2-D NumPy array if NumPy is available, or else a list of
+        lists
+        input boards: a non-empty list of digitstrs, or of Board or
+        PackedBoard objects, all of the same size
+    """
+    first = boards[0]
+    if numpy == None:
+        if type(first) == str:
+            return [parse_digitstr(digitstr) for digitstr in boards]
+        return [board.tile_list() for board in boards]
+
+    if type(first) == str:
+        # maps the characters of all the digitstrs at once
+        cells = len(first)
+        chars = numpy.frombuffer(''.join(boards).encode('ascii'), dtype=numpy.uint8)
+        tiles = CHAR_TILES[chars].reshape(len(boards), cells)
+        # checks that every digitstr has every tile once, as parse_digitstr does
+        assert((numpy.sort(tiles, axis=1) == numpy.arange(cells)).all())
+        return tiles
+    tables = first.tables
+    if isinstance(first, PackedBoard) and tables.cells * tables.cell_bits <= 64:
+        # unpacks every cell of every board with one shift and mask each
+        packed = numpy.array([board.packed for board in boards], dtype=numpy.uint64)
+        shifts = numpy.array(tables.shifts, dtype=numpy.uint64)
+        tiles = (packed[:, None] >> shifts[None, :]) & numpy.uint64(tables.cell_mask)
+        return tiles.astype(numpy.uint8)
+    return numpy.array([board.tile_list() for board in boards], dtype=numpy.uint8)
+
+def table_sums(tiles, which):
+    """ returns a list of the sums of the input table's entries over the
+        tiles of each board
+        inputs:
+          * tiles - a value returned by tile_array
+          * which - 0 for the misplaced table and 1 for the Manhattan table
+    """
+    if len(tiles) == 0:
+        return []
+    size = math.isqrt(len(tiles[0]))
+    if numpy == None:
+        tables = get_tables(size)
+        table = [tables.misplaced, tables.manhattan][which]
+        sums = []
+        for cells in tiles:
+            total = 0
+            for i in range(len(cells)):
+                total += table[cells[i]][i]
+            sums += [total]
+        return sums
+    table = get_numpy_tables(size)[which]
+    return table[tiles, numpy.arange(size * size)].sum(axis=1).tolist()
+
+def misplaced_batch(tiles):
+    """ returns a list of the number of misplaced tiles of each board
+        input tiles: a value returned by tile_array
+    """
+    return table_sums(tiles, 0)
+
+def manhattan_batch(tiles):
+    """ returns a list of the Manhattan distance of each board
+        input tiles: a value returned by tile_array
+    """
+    return table_sums(tiles, 1)
+
+def solvable_batch(tiles):
+    """ returns a list of booleans of whether or not the goal can be
+        reached from each board
+        input tiles: a value returned by tile_array
+    """
+    if len(tiles) == 0:
+        return []
+    size = math.isqrt(len(tiles[0]))
+    if numpy == None:
+        return [is_solvable(list(cells), size) for cells in tiles]
+
+    # counts the pairs i < j whose tiles are in the wrong order, leaving
+    # out the blank, as board.count_inversions does
+    cells = size * size
+    t = tiles.astype(numpy.int16)
+    upper = numpy.triu(numpy.ones((cells, cells), dtype=bool), 1)
+    wrong = (t[:, :, None] > t[:, None, :]) & (t[:, None, :] != 0) & upper
+    inversions = wrong.sum(axis=(1, 2))
+    if size % 2 == 0:
+        inversions = inversions + numpy.argmin(t, axis=1) // size
+    return (inversions % 2 == 0).tolist()
@@ -0,0 +1,659 @@
+import argparse
+import json
+import multiprocessing
+import platform
+import random
+import sys
+import time
+import tracemalloc
+from searcher import *
+
+# resource only exists on Unix, so peak memory is not reported elsewhere
+try:
+    import resource
+except ImportError:
+    resource = None
+
+def make_puzzles(num_moves, count, seed = 0):
+    """ returns a list of count digitstrs whose optimal solutions take exactly
+        num_moves moves, chosen with a fixed random seed
+        inputs:
+          * num_moves - the optimal solution length of every puzzle
+          * count - the number of puzzles to return
+          * seed - the seed of the random choice, so runs can be repeated
+    """
+    # walks breadth-first out from the goal, keeping only the last layer
+    goal = '012345678'
+    targets = get_tables(3).move_targets
+    seen = {goal}
+    layer = [goal]
+    for depth in range(num_moves):
+        next_layer = []
+        for digitstr in layer:
+            blank = digitstr.index('0')
+            for direction in MOVES:
+                target = targets[direction][blank]
+                if target == -1:
+                    continue
+                cells = list(digitstr)
+                cells[blank], cells[target] = cells[target], '0'
+                new_ds = ''.join(cells)
+                if new_ds not in seen:
+                    seen.add(new_ds)
+                    next_layer += [new_ds]
+        layer = next_layer
+
+    # sorts the layer first, so the choice only depends on the seed
+    layer.sort()
+    return random.Random(seed).sample(layer, count)
+
+def make_walk_puzzles(size, num_moves, count, seed = 0):
+    """ returns a list of count digitstrs of size x size boards, each made by
+        num_moves random moves from the goal that never undo the move before,
+        so their optimal solutions take at most num_moves moves
+        inputs:
+          * size - the number of rows and columns
+          * num_moves - the length of each random walk
+          * count - the number of puzzles to return
+          * seed - the seed of the random walks, so runs can be repeated
+    """
+    rng = random.Random(seed)
+    puzzles = []
+    for i in range(count):
+        b = PackedBoard(get_tables(size).goal_digits)
+        last = None
+        moves = 0
+        while moves < num_moves:
+            m = rng.choice(MOVES)
+            if last != None and m == INVERSE_MOVES[last]:
+                continue
+            if b.move_blank(m):
+                last = m
+                moves += 1
+        puzzles += [b.digit_string()]
+    return puzzles
+
+class ListBFSearcher(Searcher):
+    """ The list-based breadth-first searcher that BFSearcher replaced,
+        kept as the baseline of the bfs benchmark.
+    """
+    def next_state(self):
+        """ removes and returns the first state in the list self.states
+        """
+        s = self.states[0]
+        self.states.remove(s)
+        return s
+
+def run(searcher, digitstrs, board_class = Board):
+    """ solves every input digitstr with a new searcher and returns a tuple
+        of the total states tested and the seconds spent
+        inputs:
+          * searcher - a function that returns a new Searcher object
+          * digitstrs - a list of digitstrs
+          * board_class - the board representation to use
+    """
+    num_tested = 0
+    start = time.perf_counter()
+    for digitstr in digitstrs:
+        s = searcher()
+        s.find_solution(State(board_class(digitstr), None, 'init'))
+        num_tested += s.num_tested
+    return num_tested, time.perf_counter() - start
+
+def bench_bfs(count = 10, seed = 0):
+    """ prints the states tested per second by the list-based and the
+        deque-based breadth-first searchers on the 10- and 15-move tiers
+        inputs:
+          * count - the number of puzzles in each tier
+          * seed - the seed used to choose the puzzles
+    """
+    print('tier      searcher        states tested   seconds   states/sec')
+    print('-' * 62)
+    for num_moves in [10, 15]:
+        puzzles = make_puzzles(num_moves, count, seed)
+        for name, searcher in [('list BFS', lambda: ListBFSearcher(-1)),
+                               ('deque BFS', lambda: BFSearcher(-1))]:
+            num_tested, seconds = run(searcher, puzzles)
+            print(f'{num_moves:>2} moves  {name:<15} {num_tested:>13} ' +
+                  f'{seconds:>9.2f} {num_tested / seconds:>12.0f}')
+
+def bench_15puzzle(count = 3, seed = 0, timeout = 5):
+    """ prints how many Fifteen Puzzle boards each searcher solves within a
+        time limit, on random walks of 20, 30 and 40 moves from the goal
+        inputs:
+          * count - the number of puzzles in each tier
+          * seed - the seed of the random walks
+          * timeout - the number of seconds allowed for each board
+    """
+    # imported here because eight_puzzle is the driver built on this module
+    from eight_puzzle import solve_board
+
+    searchers = [('BFS', None), ('BiBFS', None), ('Greedy', h2), ('A*', h2),
+                 ('IDA*', h2), ('A*', hpdb), ('IDA*', hpdb)]
+    print(f'time limit {timeout} seconds per board')
+    print('walk      algorithm        num. solved   avg. moves   avg. states tested   seconds')
+    print('-' * 84)
+    for num_moves in [20, 30, 40]:
+        puzzles = make_walk_puzzles(4, num_moves, count, seed)
+        for algorithm, heuristic in searchers:
+            name = algorithm
+            if heuristic != None:
+                name += ' (' + heuristic.__name__ + ')'
+            solved = []
+            start = time.perf_counter()
+            for digitstr in puzzles:
+                result = solve_board(digitstr, algorithm, -1, heuristic, PackedBoard,
+                                     False, timeout)
+                status, moves, num_tested = result.status, result.num_moves, result.num_tested
+                if status == 'solved':
+                    solved += [[moves, num_tested]]
+            seconds = time.perf_counter() - start
+            if len(solved) == 0:
+                print(f'{num_moves:>2} moves  {name:<16} {0:>4} of {count:<5}' +
+                      f'{"-":>11} {"-":>20} {seconds:>9.1f}')
+            else:
+                avg_moves = sum([s[0] for s in solved]) / len(solved)
+                avg_tested = sum([s[1] for s in solved]) / len(solved)
+                print(f'{num_moves:>2} moves  {name:<16} {len(solved):>4} of {count:<5}' +
+                      f'{avg_moves:>11.1f} {avg_tested:>20.1f} {seconds:>9.1f}')
+
+def bench_heuristics(count = 5, seed = 0):
+    """ prints the states tested and the seconds spent by A* with each
+        heuristic, on 3x3 boards 20 and 24 moves from the goal and on 4x4
+        random walks of 40 moves
+        inputs:
+          * count - the number of puzzles in each tier
+          * seed - the seed used to choose the puzzles
+    """
+    tiers = [('3x3, 20 moves', make_puzzles(20, count, seed)),
+             ('3x3, 24 moves', make_puzzles(24, count, seed)),
+             ('4x4, 40-move walk', make_walk_puzzles(4, 40, count, seed))]
+    heuristics = [h2, h3, hpdb, hmax(h3, hpdb)]
+    print('tier                heuristic          states tested   seconds')
+    print('-' * 64)
+    for tier, puzzles in tiers:
+        for heuristic in heuristics:
+            num_tested, seconds = run(lambda: AStarSearcher(-1, heuristic), puzzles,
+                                      PackedBoard)
+            print(f'{tier:<19} {heuristic.__name__:<18} {num_tested:>13} {seconds:>9.2f}')
+
+def bench_cache(count = 20, seed = 0):
+    """ prints the heuristic cache hits, misses and seconds of IDA* and A*
+        with h3 and hpdb on a batch of 3x3 boards 20 moves from the goal,
+        for several cache sizes
+        inputs:
+          * count - the number of puzzles in the batch
+          * seed - the seed used to choose the puzzles
+    """
+    puzzles = make_puzzles(20, count, seed)
+    print('searcher      heuristic   cache size       hits     misses   hit rate   seconds')
+    print('-' * 80)
+    for algorithm, searcher in [('IDA*', IDAStarSearcher), ('A*', AStarSearcher)]:
+        for heuristic in [h3, hpdb]:
+            for cache_size in [None, 1000, 10000, 100000]:
+                cache = None
+                h = heuristic
+                if cache_size != None:
+                    # a new cache for each run, so runs do not share boards
+                    cache = HeuristicCache(heuristic, cache_size)
+                    h = cache
+                start = time.perf_counter()
+                for digitstr in puzzles:
+                    s = searcher(-1, h)
+                    s.find_solution(State(PackedBoard(digitstr), None, 'init'))
+                seconds = time.perf_counter() - start
+                if cache == None:
+                    print(f'{algorithm:<13} {heuristic.__name__:<11} {"none":>10}' +
+                          f'{"-":>11} {"-":>10} {"-":>10} {seconds:>9.2f}')
+                else:
+                    rate = 100 * cache.hits / max(1, cache.hits + cache.misses)
+                    print(f'{algorithm:<13} {heuristic.__name__:<11} {cache_size:>10}' +
+                          f'{cache.hits:>11} {cache.misses:>10} {rate:>9.1f}% {seconds:>9.2f}')
+
+class DictBoard:
+    """ The board that Board was before it had __slots__: a __dict__, a
+        nested list of tiles and the row and column of the blank, kept as
+        the baseline of the memory benchmark.
+    """
+    def __init__(self, digitstr):
+        """ a constructor for a DictBoard object
+            input digitstr: a permutation of the digits 0-8
+        """
+        self.tiles = [[int(digitstr[3*r + c]) for c in range(3)] for r in range(3)]
+        self.blank_r = digitstr.index('0') // 3
+        self.blank_c = digitstr.index('0') % 3
+
+    def move_blank(self, direction):
+        """ returns True if the blank can be moved in the input direction
+            string, and moves it
+        """
+        r, c = self.blank_r, self.blank_c
+        if direction == 'up':
+            r -= 1
+        elif direction == 'down':
+            r += 1
+        elif direction == 'left':
+            c -= 1
+        else:
+            c += 1
+        if r < 0 or r > 2 or c < 0 or c > 2:
+            return False
+        self.tiles[self.blank_r][self.blank_c] = self.tiles[r][c]
+        self.tiles[r][c] = 0
+        self.blank_r, self.blank_c = r, c
+        return True
+
+    def copy(self):
+        """ returns a deep copy of the board
+        """
+        b = DictBoard('012345678')
+        b.tiles = [row[:] for row in self.tiles]
+        b.blank_r, b.blank_c = self.blank_r, self.blank_c
+        return b
+
+class DictState:
+    """ The State that the slotted State replaced: a __dict__ and the move
+        stored as its direction string, kept as the baseline of the memory
+        benchmark.
+    """
+    def __init__(self, board, predecessor, move):
+        """ a constructor for a DictState object
+            inputs:
+              * board - a DictBoard object
+              * predecessor - the DictState it was derived from, or None
+              * move - a direction string or 'init'
+        """
+        self.board = board
+        self.predecessor = predecessor
+        self.move = move
+        if predecessor == None:
+            self.num_moves = 0
+        else:
+            self.num_moves = predecessor.num_moves + 1
+
+    def generate_successors(self):
+        """ returns a list of the states one move away
+        """
+        successors = []
+        for move in MOVES:
+            b = self.board.copy()
+            if b.move_blank(move):
+                successors += [DictState(b, self, move)]
+        return successors
+
+def node_bytes(digitstr, board_class, num_nodes, state_class = State):
+    """ returns the average number of bytes allocated for each State object
+        kept in a breadth-first tree of num_nodes states from the input board,
+        as measured by tracemalloc (including 8 bytes for its place in the
+        list that keeps it alive, as in a searcher's frontier)
+        inputs:
+          * digitstr - the digitstr of the root board
+          * board_class - the board representation to use
+          * num_nodes - the number of states to create
+          * state_class - State, or DictState with DictBoard for the nodes
+            as they were before they had __slots__ and move codes
+    """
+    tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+    nodes = [state_class(board_class(digitstr), None, 'init')]
+    i = 0
+    while len(nodes) < num_nodes:
+        nodes += nodes[i].generate_successors()
+        i += 1
+    used = tracemalloc.get_traced_memory()[0] - before
+    tracemalloc.stop()
+    return used / len(nodes)
+
+def bench_memory(count = 3, seed = 0, num_nodes = 200000):
+    """ prints the bytes per State object of each board representation, for
+        trees grown from boards of the 15-move tier, starting with the
+        node as it was before State and Board had __slots__ and move codes
+        inputs:
+          * count - the number of puzzles
+          * seed - the seed used to choose the puzzles
+          * num_nodes - the number of states in each tree
+    """
+    puzzles = make_puzzles(15, count, seed)
+    print('node                     nodes per tree   bytes per node')
+    print('-' * 57)
+    per_node = {}
+    for label, state_class, board_class in [('DictState + DictBoard', DictState, DictBoard),
+                                            ('State + Board', State, Board),
+                                            ('State + PackedBoard', State, PackedBoard)]:
+        total = 0
+        for digitstr in puzzles:
+            total += node_bytes(digitstr, board_class, num_nodes, state_class)
+        per_node[label] = total / count
+        print(f'{label:<24} {num_nodes:>14} {per_node[label]:>16.1f}')
+    before = per_node['DictState + DictBoard']
+    after = per_node['State + PackedBoard']
+    print(f'before: {before:.1f} bytes per node, after: {after:.1f} ' +
+          f'({100 * (before - after) / before:.0f}% less)')
+
+def bench_batch(seed = 0, repeats = 200):
+    """ prints the microseconds per board of the Manhattan distance computed
+        from the tiles one board at a time in Python and in batches with
+        NumPy, for growing batch sizes, and the smallest batch size where
+        NumPy wins. Boards also carry the value, and reading it is shown for
+        comparison.
+        inputs:
+          * seed - the seed of the random boards
+          * repeats - the number of times each measurement is repeated
+    """
+    import batch_heuristics
+    if batch_heuristics.numpy == None:
+        print('NumPy is not installed, so the batch functions loop in Python')
+    rng = random.Random(seed)
+    for size in [3, 4]:
+        goal = PackedBoard(get_tables(size).goal_digits)
+        print(f'{size}x{size} boards')
+        print('batch size   python loop   numpy batch   carried value   (microseconds per board)')
+        print('-' * 80)
+        crossover = None
+        for batch_size in [1, 2, 4, 8, 16, 32, 64, 128, 256, 1024, 4096]:
+            boards = []
+            for i in range(batch_size):
+                b = goal.copy()
+                for j in range(100):
+                    b.move_blank(rng.choice(MOVES))
+                boards += [b]
+            table = get_tables(size).manhattan
+
+            # times the same work per board: get the tiles and add up
+            # the table entries
+            times = []
+            for method in range(3):
+                start = time.perf_counter()
+                for r in range(repeats):
+                    if method == 0:
+                        for board in boards:
+                            cells = board.tile_list()
+                            total = 0
+                            for i in range(len(cells)):
+                                total += table[cells[i]][i]
+                    elif method == 1:
+                        manhattan_batch(tile_array(boards))
+                    else:
+                        for board in boards:
+                            board.manhattangeo()
+                times += [1e6 * (time.perf_counter() - start) / (repeats * batch_size)]
+            if crossover == None and batch_heuristics.numpy != None and times[1] < times[0]:
+                crossover = batch_size
+            print(f'{batch_size:>10} {times[0]:>13.2f} {times[1]:>13.2f} {times[2]:>15.3f}')
+        if crossover == None:
+            print('NumPy did not win at any batch size')
+        else:
+            print(f'NumPy wins from batches of {crossover} boards')
+        print('')
+
+def bench_sweep(count = 20, seed = 0):
+    """ prints the states tested and seconds of solving a batch of puzzles
+        with one bidirectional search each and with one sweep out from the
+        goal, for growing solution lengths
+        inputs:
+          * count - the number of puzzles in each tier
+          * seed - the seed used to choose the puzzles
+    """
+    from sweep import solve_all
+    print('tier      method          states tested   seconds')
+    print('-' * 52)
+    for num_moves in [10, 15, 20, 25]:
+        digitstrs = make_puzzles(num_moves, count, seed)
+        num_tested, seconds = run(lambda: BidirectionalSearcher(-1), digitstrs, PackedBoard)
+        print(f'{num_moves:>4}      {"BiBFS":<15} {num_tested:>13}   {seconds:>7.3f}')
+        start = time.perf_counter()
+        results = solve_all(digitstrs)
+        seconds = time.perf_counter() - start
+        # the boards tested by the sweep before it found the farthest board
+        num_tested = max([results[digitstr][2] for digitstr in digitstrs])
+        print(f'{num_moves:>4}      {"sweep":<15} {num_tested:>13}   {seconds:>7.3f}')
+
+# the version of the puzzle corpora of the suite; change it whenever
+# make_puzzles or the tiers change, since results are only compared
+# between runs on the same corpora
+CORPUS_VERSION = 1
+
+# the optimal solution lengths of the tiers of the suite
+SUITE_TIERS = [5, 10, 15]
+
+# the rows of each table of the suite: a label and the arguments of
+# create_searcher (algorithm, depth limit and heuristic)
+SUITE = [('random', 'random', -1, None),
+         ('BFS', 'BFS', -1, None),
+         ('DFS (depth limit 20)', 'DFS', 20, None),
+         ('DFS (depth limit 50)', 'DFS', 50, None),
+         ('Greedy Search', 'Greedy', -1, h1),
+         ('A*', 'A*', -1, h1),
+         ('IDA* (h2)', 'IDA*', -1, h2),
+         ('BiBFS', 'BiBFS', -1, None),
+         ('oracle', 'oracle', -1, None)]
+
+def peak_rss_kb():
+    """ returns the largest resident set size of this process so far in
+        kilobytes, or None if the platform cannot report it
+    """
+    if resource == None:
+        return None
+    rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # macOS reports bytes where Linux reports kilobytes
+    if sys.platform == 'darwin':
+        rss //= 1024
+    return rss
+
+def run_suite_row(label, algorithm, depth_limit, heuristic, puzzles, seed, timeout):
+    """ solves every input puzzle with one algorithm and returns a dictionary
+        of the row's results, including the peak memory of the process
+        inputs:
+          * label - the name of the row in the tables
+          * algorithm, depth_limit, heuristic - the arguments of
+            create_searcher
+          * puzzles - a list of digitstrs
+          * seed - the seed of the random searcher, reset for each puzzle
+          * timeout - the number of seconds allowed for each puzzle
+    """
+    # imported here because eight_puzzle is the driver built on this module
+    from eight_puzzle import solve_board
+
+    boards = []
+    for digitstr in puzzles:
+        random.seed(seed)
+        start = time.perf_counter()
+        result = solve_board(digitstr, algorithm, depth_limit, heuristic,
+                             PackedBoard, False, timeout)
+        seconds = time.perf_counter() - start
+        boards += [{'digitstr': digitstr, 'status': result.status, 'moves': result.num_moves,
+                    'states': result.num_tested, 'seconds': seconds}]
+
+    solved = [board for board in boards if board['status'] == 'solved']
+    seconds = sum([board['seconds'] for board in boards])
+    states = sum([board['states'] for board in boards])
+    row = {'label': label, 'algorithm': algorithm, 'depth_limit': depth_limit,
+           'heuristic': None if heuristic == None else heuristic.__name__,
+           'solved': len(solved), 'avg_moves': None, 'avg_states': None,
+           'seconds': seconds, 'nodes_per_sec': states / seconds if seconds > 0 else None,
+           'peak_rss_kb': peak_rss_kb(), 'boards': boards}
+    if len(solved) > 0:
+        row['avg_moves'] = sum([board['moves'] for board in solved]) / len(solved)
+        row['avg_states'] = sum([board['states'] for board in solved]) / len(solved)
+    return row
+
+def run_suite(count = 10, seed = 0, timeout = 60):
+    """ returns a dictionary of the results of every row of SUITE on every
+        tier of SUITE_TIERS, running each row in a new process so that its
+        peak memory is its own
+        inputs:
+          * count - the number of puzzles in each tier
+          * seed - the seed used to choose the puzzles and by the random
+            searcher
+          * timeout - the number of seconds allowed for each puzzle
+    """
+    report = {'corpus_version': CORPUS_VERSION, 'count': count, 'seed': seed,
+              'timeout': timeout, 'python': platform.python_version(),
+              'tiers': []}
+    for num_moves in SUITE_TIERS:
+        puzzles = make_puzzles(num_moves, count, seed)
+        tier = {'moves': num_moves, 'puzzles': puzzles, 'rows': []}
+        for label, algorithm, depth_limit, heuristic in SUITE:
+            with multiprocessing.Pool(1) as pool:
+                row = pool.apply(run_suite_row, (label, algorithm, depth_limit, heuristic,
+                                                 puzzles, seed, timeout))
+            tier['rows'] += [row]
+            print(f'{num_moves:>2} moves  {label:<22} {row["seconds"]:>8.2f} seconds',
+                  file=sys.stderr)
+        report['tiers'] += [tier]
+    return report
+
+def format_number(x):
+    """ returns the input number as results.txt writes it: an integer
+        without a decimal point, and anything else rounded to 2 places
+        input x: an int or float
+    """
+    x = round(x, 2)
+    if x == int(x):
+        return str(int(x))
+    return str(x)
+
+def render_tables(report):
+    """ returns a string of the tables of the input suite report, in the
+        layout of results.txt
+        input report: a dictionary returned by run_suite
+    """
+    s = ''
+    for tier in report['tiers']:
+        title = f'puzzles with {tier["moves"]}-move optimal solutions'
+        s += title + '\n'
+        s += '-' * len(title) + '\n'
+        s += 'algorithm              num. solved    avg. moves    avg. states tested\n'
+        s += '-' * 70 + '\n'
+        for row in tier['rows']:
+            s += f'{row["label"]:<23}' + f'{str(row["solved"]) + " puzzles":<15}'
+            if row['solved'] == 0:
+                s += f'{"-":<14}-\n'
+            else:
+                s += f'{format_number(row["avg_moves"]) + " moves":<14}'
+                s += format_number(row['avg_states']) + ' states\n'
+        s += '\n'
+    return s
+
+def write_results_txt(report, filename = 'results.txt'):
+    """ replaces the tables at the start of the input file with the tables of
+        the input suite report, keeping the header above them and the text
+        from 'Reflection:' on
+        inputs:
+          * report - a dictionary returned by run_suite
+          * filename - the file to rewrite
+    """
+    f = open(filename, 'r')
+    text = f.read()
+    f.close()
+    start = text.index('puzzles with ')
+    end = text.index('Reflection:')
+    f = open(filename, 'w')
+    f.write(text[:start] + render_tables(report) + text[end:])
+    f.close()
+
+def find_regressions(report, baseline, tolerance = 0.1, time_tolerance = None):
+    """ returns a list of strings describing each row of the input report that
+        is worse than the same row of the baseline report
+        inputs:
+          * report, baseline - dictionaries returned by run_suite
+          * tolerance - the fraction by which the average states tested may
+            grow before it counts as a regression
+          * time_tolerance - the fraction by which the seconds may grow, or
+            None to ignore wall time, which depends on the machine
+    """
+    if (baseline['corpus_version'] != report['corpus_version'] or
+        baseline['count'] != report['count'] or baseline['seed'] != report['seed']):
+        return ['the baseline was run on different puzzle corpora']
+
+    old_rows = {}
+    for tier in baseline['tiers']:
+        for row in tier['rows']:
+            old_rows[(tier['moves'], row['label'])] = row
+
+    regressions = []
+    for tier in report['tiers']:
+        for row in tier['rows']:
+            name = f'{tier["moves"]} moves, {row["label"]}'
+            old = old_rows.get((tier['moves'], row['label']))
+            if old == None:
+                continue
+            if row['solved'] < old['solved']:
+                regressions += [f'{name}: solved {row["solved"]}, was {old["solved"]}']
+            elif row['solved'] > 0 and old['solved'] > 0:
+                if row['avg_moves'] > old['avg_moves'] * (1 + tolerance):
+                    regressions += [f'{name}: {row["avg_moves"]:.2f} avg. moves, ' +
+                                    f'was {old["avg_moves"]:.2f}']
+                if row['avg_states'] > old['avg_states'] * (1 + tolerance):
+                    regressions += [f'{name}: {row["avg_states"]:.2f} avg. states tested, ' +
+                                    f'was {old["avg_states"]:.2f}']
+            if time_tolerance != None and row['seconds'] > old['seconds'] * (1 + time_tolerance):
+                regressions += [f'{name}: {row["seconds"]:.2f} seconds, ' +
+                                f'was {old["seconds"]:.2f}']
+    return regressions
+
+def bench_suite(args = None):
+    """ runs the benchmark suite, writes its JSON report, prints its tables
+        and returns 1 if it regressed from a baseline report, or else 0
+        input args: a list of command-line arguments, by default the ones
+        after the benchmark name
+    """
+    parser = argparse.ArgumentParser(prog='python benchmark.py suite')
+    parser.add_argument('--count', type=int, default=10, help='puzzles per tier')
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--timeout', type=float, default=60, help='seconds per puzzle')
+    parser.add_argument('--out', default='suite-results.json', help='the JSON report to write')
+    parser.add_argument('--baseline', help='a JSON report to compare against')
+    parser.add_argument('--tolerance', type=float, default=0.1,
+                        help='allowed growth of avg. moves and states tested')
+    parser.add_argument('--time-tolerance', type=float, default=None,
+                        help='allowed growth of wall time (ignored by default)')
+    parser.add_argument('--write-results', action='store_true',
+                        help='also rewrite the tables of results.txt')
+    if args == None:
+        args = sys.argv[2:]
+    options = parser.parse_args(args)
+
+    report = run_suite(options.count, options.seed, options.timeout)
+    f = open(options.out, 'w')
+    json.dump(report, f, indent=1)
+    f.close()
+    print(render_tables(report), end='')
+    print('wall time, nodes/sec and peak memory')
+    print('-' * 70)
+    for tier in report['tiers']:
+        for row in tier['rows']:
+            rate = '-' if row['nodes_per_sec'] == None else f'{row["nodes_per_sec"]:.0f}'
+            rss = '-' if row['peak_rss_kb'] == None else f'{row["peak_rss_kb"]} KB'
+            print(f'{tier["moves"]:>2} moves  {row["label"]:<22} {row["seconds"]:>8.2f} s' +
+                  f' {rate:>10} nodes/s {rss:>12}')
+    if options.write_results:
+        write_results_txt(report)
+
+    if options.baseline != None:
+        f = open(options.baseline, 'r')
+        baseline = json.load(f)
+        f.close()
+        regressions = find_regressions(report, baseline, options.tolerance,
+                                       options.time_tolerance)
+        print('')
+        if len(regressions) > 0:
+            print(f'{len(regressions)} regressions from {options.baseline}:')
+            for regression in regressions:
+                print('  ' + regression)
+            return 1
+        print(f'no regressions from {options.baseline}')
+    return 0
+
+if __name__ == "__main__":
+
+    # runs the benchmark named on the command line
+    benchmarks = {'bfs': bench_bfs, '15puzzle': bench_15puzzle,
+                  'heuristics': bench_heuristics, 'cache': bench_cache,
+                  'memory': bench_memory, 'batch': bench_batch,
+                  'sweep': bench_sweep, 'suite': bench_suite}
+    if len(sys.argv) < 2 or sys.argv[1] not in benchmarks:
+        print('usage: python benchmark.py', '|'.join(benchmarks))
+    else:
+        # the suite returns 1 when it finds a regression
+        sys.exit(benchmarks[sys.argv[1]]())
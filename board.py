@@ -1,18 +1,207 @@
+import math
+
+# the characters used for the tiles in a digitstr: the digits 0-9 and then
+# the letters a-z, so every tile of a board up to 6x6 is one character
+TILE_CHARS = '0123456789abcdefghijklmnopqrstuvwxyz'
+
+# the change in row and column of the blank for each direction string
+DIRECTIONS = {'up': (-1, 0), 'down': (1, 0), 'left': (0, -1), 'right': (0, 1)}
+
+# the small-integer code of each direction string; states store their move
+# as a code, and boards accept either the code or the string
+MOVE_CODES = {'up': 0, 'down': 1, 'left': 2, 'right': 3}
+
+class SizeTables:
+    """ A class for objects that hold the precomputed tables of one board
+        size, which every board of that size shares.
+    """
+    def __init__(self, size):
+        """ a constructor for the SizeTables object of size x size boards
+            input size: the number of rows and columns, from 2 to 6
+        """
+        self.size = size
+        self.cells = size * size
+
+        # misplaced[tile][cell] is 1 if the tile is not the blank and cell
+        # is not its goal cell, and manhattan[tile][cell] is the number of
+        # rows plus columns between cell and the goal cell of the tile
+        self.misplaced = [[int(tile != 0 and tile != cell) for cell in range(self.cells)]
+                          for tile in range(self.cells)]
+        self.manhattan = [[0 if tile == 0 else
+                           abs(tile // size - cell // size) + abs(tile % size - cell % size)
+                           for cell in range(self.cells)] for tile in range(self.cells)]
+
+        # move_targets[direction][cell] is the cell the blank moves to from
+        # cell, or -1 if the blank would leave the board, where direction is
+        # a direction string or its move code
+        self.move_targets = {}
+        for direction in DIRECTIONS:
+            dr, dc = DIRECTIONS[direction]
+            row = []
+            for i in range(self.cells):
+                r = i // size + dr
+                c = i % size + dc
+                if 0 <= r < size and 0 <= c < size:
+                    row += [size*r + c]
+                else:
+                    row += [-1]
+            self.move_targets[direction] = row
+            self.move_targets[MOVE_CODES[direction]] = row
+
+        # row_codes[cell][tile] and col_codes[cell][tile] are what the tile
+        # at cell adds to the code of the cell's row or column: if the tile's
+        # goal is in that line, one more than its goal position along the
+        # line, times a power of size + 1 for the cell's position along it.
+        # line_conflicts[code] is the extra moves that code's tiles need.
+        base = size + 1
+        self.row_codes = [[0] * self.cells for cell in range(self.cells)]
+        self.col_codes = [[0] * self.cells for cell in range(self.cells)]
+        for cell in range(self.cells):
+            r, c = divmod(cell, size)
+            for tile in range(1, self.cells):
+                if tile // size == r:
+                    self.row_codes[cell][tile] = (tile % size + 1) * base**c
+                if tile % size == c:
+                    self.col_codes[cell][tile] = (tile // size + 1) * base**r
+        self.line_conflicts = [self.conflict_moves(code) for code in range(base**size)]
+
+        # the bits used for each cell of a packed integer, which is 4 for
+        # the 3x3 and 4x4 boards and 5 for the 5x5 board
+        self.cell_bits = (self.cells - 1).bit_length()
+        self.cell_mask = (1 << self.cell_bits) - 1
+        self.shifts = [self.cell_bits * i for i in range(self.cells)]
+
+        # the goal state, with the blank in the top-left corner
+        self.goal_digits = TILE_CHARS[:self.cells]
+        self.goal_tiles = [[size*r + c for c in range(size)] for r in range(size)]
+        self.goal_packed = self.pack(list(range(self.cells)))
+
+    def conflict_moves(self, code):
+        """ returns the extra moves needed by the tiles of one line whose
+            goal is in that line, given the code of their goal positions
+            input code: a line code, as described in the constructor
+
+            Tiles in their goal line whose goal positions are in the wrong
+            order must leave the line to pass each other. The fewest tiles
+            to take out are those not in the longest increasing run of goal
+            positions, and each one costs 2 extra moves.
+        """
+        goals = []
+        while code > 0:
+            code, digit = divmod(code, self.size + 1)
+            if digit > 0:
+                goals += [digit]
+        # longest[i] is the longest increasing run that ends at goals[i]
+        longest = []
+        for i in range(len(goals)):
+            longest += [1 + max([longest[j] for j in range(i) if goals[j] < goals[i]],
+                                default=0)]
+        return 2 * (len(goals) - max(longest, default=0))
+
+    def linear_conflicts(self, cells):
+        """ returns the extra moves beyond the Manhattan distance that the
+            linear conflicts of every row and column need
+            input cells: a list of the tiles in row-major order
+        """
+        size = self.size
+        rows = [0] * size
+        cols = [0] * size
+        i = 0
+        for tile in cells:
+            rows[i // size] += self.row_codes[i][tile]
+            cols[i % size] += self.col_codes[i][tile]
+            i += 1
+        total = 0
+        for code in rows + cols:
+            total += self.line_conflicts[code]
+        return total
+
+    def pack(self, cells):
+        """ returns the integer that stores the input tiles with cell_bits
+            bits per cell, where cell 0 is in the lowest bits
+            input cells: a list of the tiles in row-major order
+        """
+        packed = 0
+        for i in range(len(cells)):
+            packed |= cells[i] << self.shifts[i]
+        return packed
+
+# the SizeTables object of each board size that has been used
+size_tables = {}
+
+def get_tables(size):
+    """ returns the SizeTables object of the input board size, creating it
+        only the first time it is asked for
+        input size: the number of rows and columns
+    """
+    if size not in size_tables:
+        size_tables[size] = SizeTables(size)
+    return size_tables[size]
+
+def parse_digitstr(digitstr):
+    """ returns a list of the tiles of the input digitstr in row-major order
+        input digitstr: a permutation of the first n*n characters of
+        TILE_CHARS, for an n x n board
+    """
+    # check that digitstr has a square number of characters, from 2x2 up
+    # to 6x6, containing every tile once
+    size = math.isqrt(len(digitstr))
+    assert(size >= 2 and size * size == len(digitstr))
+    assert(len(digitstr) <= len(TILE_CHARS))
+    cells = [TILE_CHARS.find(ch) for ch in digitstr.lower()]
+    assert(sorted(cells) == list(range(len(digitstr))))
+    return cells
+
+def count_inversions(cells):
+    """ returns the number of pairs of tiles, not counting the blank, that
+        are in the opposite order from the goal state
+        input cells: a list of the tiles in row-major order
+    """
+    tiles = [tile for tile in cells if tile != 0]
+    inversions = 0
+    for i in range(len(tiles)):
+        for j in range(i + 1, len(tiles)):
+            if tiles[j] < tiles[i]:
+                inversions += 1
+    return inversions
+
+def is_solvable(cells, size):
+    """ returns a boolean value of whether or not the goal state can be
+        reached from the input tiles
+        inputs:
+          * cells - a list of the tiles in row-major order
+          * size - the number of rows and columns
+    """
+    inversions = count_inversions(cells)
+    # on an odd-width board every move keeps the parity of the inversions;
+    # on an even-width board a vertical move also flips it, so the parity
+    # of the inversions plus the row of the blank is kept instead
+    if size % 2 == 1:
+        return inversions % 2 == 0
+    return (inversions + cells.index(0) // size) % 2 == 0
+
 class Board:
-    """ A class for objects that represent an Eight Puzzle board.
+    """ A class for objects that represent an Eight Puzzle board, or any
+        other n x n sliding puzzle board.
     """
+    # fixed attributes instead of a __dict__, since searches keep a board
+    # for every state
+    __slots__ = ('tables', 'tiles', 'blank_r', 'blank_c', 'misplaced', 'manhattan')
+
     def __init__(self, digitstr):
         """ a constructor for a Board object whose configuration
             is specified by the input digitstr
-            input: digitstr is a permutation of the digits 0-9
+            input: digitstr is a permutation of the digits 0-8 for the
+            Eight Puzzle, or of the first n*n characters of TILE_CHARS for
+            an n x n board (such as 0-9 and a-f for the Fifteen Puzzle)
         """
-        # check that digitstr is 9-character string
-        # containing all digits from 0-9
-        assert(len(digitstr) == 9)
-        for x in range(9):
-            assert(str(x) in digitstr)
+        # check that digitstr is an n*n-character string
+        # containing every tile once
+        cells = parse_digitstr(digitstr)
+        size = math.isqrt(len(cells))
+        self.tables = get_tables(size)
 
-        self.tiles = [[0] * 3 for x in range(3)]
+        self.tiles = [[0] * size for x in range(size)]
         self.blank_r = -1
         self.blank_c = -1
 
@@ -25,13 +214,21 @@ class Board:
             nrow = []
             for c in range(len(self.tiles[r])):
                 # adds the input number into the new row
-                nrow += [int(digitstr[3*r + c])]
+                nrow += [cells[size*r + c]]
                 # assigns the positions of where the blank is
-                if int(digitstr[3*r + c]) == 0:
+                if cells[size*r + c] == 0:
                     self.blank_r = r
                     self.blank_c = c
             # replaces the empty original row with new row
             self.tiles[r] = nrow
+
+        # the heuristic values are computed once here, and then kept up to
+        # date by move_blank and passed on by copy
+        self.misplaced = 0
+        self.manhattan = 0
+        for i in range(len(cells)):
+            self.misplaced += self.tables.misplaced[cells[i]][i]
+            self.manhattan += self.tables.manhattan[cells[i]][i]
         
     ### Add your other method definitions below. ###
     
@@ -41,15 +238,17 @@ class Board:
         """
         # creates an empty board accumulator variable 
         board = ""
+        # lines up the columns of boards with two-digit tiles
+        width = len(str(self.tables.cells - 1))
         # loops through each tile of the gameboard
         for r in range(len(self.tiles)):
             for c in range(len(self.tiles[r])):
                 # tests if the tile is the blank, and adds _ if so
                 if self.tiles[r][c] == 0:
-                    board += ("_" + " ")
+                    board += ("_".rjust(width) + " ")
                 # adds non 0s to the board string
                 else:
-                    board += (str(self.tiles[r][c]) + " ")
+                    board += (str(self.tiles[r][c]).rjust(width) + " ")
             # makes a new line for each row
             board += ("\n")
                 
@@ -59,57 +258,36 @@ class Board:
     def move_blank(self, direction):
         """ returns a boolean value of whether or not the blank can be moved
             in the input direction, and moves the blank 
-            input direction: an approriate direction string
+            input direction: an approriate direction string or move code
         """
-        # returns False if input is not a direction string
-        if (direction != "up") and (direction != "down") and (direction != "left") and (direction != "right"):
+        # returns False if input is not a direction string or move code
+        targets = self.tables.move_targets.get(direction)
+        if targets == None:
             return False
-        
-        # following if/else statements returns False if direction cannot
-        # be moved
-        if direction == "up":
-            if self.blank_r == 0:
-                return False
-            # switches blank with cell one row above
-            else:
-                self.tiles[self.blank_r][self.blank_c] = self.tiles[self.blank_r - 1][self.blank_c]
-                self.tiles[self.blank_r - 1][self.blank_c] = 0
-                # updates the blank position
-                self.blank_r -= 1
-                return True
-        
-        elif direction == "down":
-            if self.blank_r == 2:
-                return False
-            # switches blank with cell one row below
-            else:
-                self.tiles[self.blank_r][self.blank_c] = self.tiles[self.blank_r + 1][self.blank_c]
-                self.tiles[self.blank_r + 1][self.blank_c] = 0
-                # updates the blank position
-                self.blank_r += 1
-                return True
-            
-        elif direction == "left":
-            if self.blank_c == 0:
-                return False
-            # switches blank with cell one row to the left
-            else:
-                self.tiles[self.blank_r][self.blank_c] = self.tiles[self.blank_r][self.blank_c - 1]
-                self.tiles[self.blank_r][self.blank_c - 1] = 0
-                # updates the blank position
-                self.blank_c -= 1
-                return True
-            
-        elif direction == "right":
-            if self.blank_c == 2:
-                return False
-            # switches blank with cell one row to the right
-            else:
-                self.tiles[self.blank_r][self.blank_c] = self.tiles[self.blank_r][self.blank_c + 1]
-                self.tiles[self.blank_r][self.blank_c + 1] = 0
-                # updates the blank position
-                self.blank_c += 1
-                return True
+
+        # returns False if the blank would leave the board
+        size = self.tables.size
+        target = targets[size*self.blank_r + self.blank_c]
+        if target == -1:
+            return False
+        r, c = divmod(target, size)
+
+        # switches the blank with the tile in that cell
+        tile = self.tiles[r][c]
+        self.tiles[self.blank_r][self.blank_c] = tile
+        self.tiles[r][c] = 0
+        # only that tile moved, so each heuristic value changes by the
+        # difference between its table entries for the two cells
+        old_cell = size*r + c
+        new_cell = size*self.blank_r + self.blank_c
+        misplaced = self.tables.misplaced[tile]
+        manhattan = self.tables.manhattan[tile]
+        self.misplaced += misplaced[new_cell] - misplaced[old_cell]
+        self.manhattan += manhattan[new_cell] - manhattan[old_cell]
+        # updates the blank position
+        self.blank_r = r
+        self.blank_c = c
+        return True
     
     # function 4
     def digit_string(self):
@@ -121,16 +299,23 @@ class Board:
         # loops through each self.tiles to add to the empty string
         for r in range(len(self.tiles)):
             for c in range(len(self.tiles[r])):
-                new_ds += str(self.tiles[r][c])
+                new_ds += TILE_CHARS[self.tiles[r][c]]
                 
         return new_ds
     
     # function 5
     def copy(self):
-        """ returns a deep copy of the board object from the constructor method
+        """ returns a deep copy of the board object, which keeps the
+            heuristic values of this one
         """
-        # creates a new Board object with that string
-        copy = Board(self.digit_string())
+        # copies the attributes directly instead of parsing a digit string
+        copy = Board.__new__(Board)
+        copy.tables = self.tables
+        copy.tiles = [row[:] for row in self.tiles]
+        copy.blank_r = self.blank_r
+        copy.blank_c = self.blank_c
+        copy.misplaced = self.misplaced
+        copy.manhattan = self.manhattan
         
         return copy
     
@@ -139,59 +324,23 @@ class Board:
         """ returns an integer of how many misplaced cells there are in the
             board from the goal state
         """
-        # creates a Board object of the goal state
-        goal_state = Board("012345678")
-        # creates an accumulator variable to track misplaced numbers
-        num_misplaced = 0
-        
-        # loops through each cell of the goal state
-        for r in range(len(goal_state.tiles)):
-            for c in range(len(goal_state.tiles[r])):
-                # adds one to the accumulator vairable if the goal state and current state cell 
-                # do not match
-                if goal_state.tiles[r][c] != self.tiles[r][c] and self.tiles[r][c] != 0:
-                    num_misplaced += 1
-        
-        return num_misplaced
+        # the count is kept up to date by move_blank
+        return self.misplaced
     
     # helper function for heurisitic 2
     def manhattangeo(self):
         """ returns a the sum of all the distances each tile needs to travel
             in order to get to the goal state
         """
-        # creates a Board object of the goal state
-        goal_state = Board("012345678")
-        # creates an accumulator variable to track misplaced numbers
-        misplaced = []
-        goaltile = []
-        totaltravel = 0
-        selftile = []
-        
-        # loops through each cell of the goal state
-        for r in range(len(goal_state.tiles)):
-            for c in range(len(goal_state.tiles[r])):
-                # adds one to the accumulator vairable if the goal state and current state cell 
-                # do not match
-                if goal_state.tiles[r][c] != self.tiles[r][c] and self.tiles[r][c] != 0:
-                    # store the number in a list and row and column of goal in another list
-                    misplaced += [goal_state.tiles[r][c]]
-                    goaltile += [[r, c]]
-                    
-        # get the row and column of the number from self
-        for num in misplaced:
-            for r in range(len(self.tiles)):
-                for c in range(len(self.tiles[r])):
-                    if self.tiles[r][c] == num:
-                        selftile += [[r, c]]
-
-
-       # compare the two goal state and other list differences and acculate them
-        for r in range(len(goaltile)):
-            for c in range(len(goaltile[r])):
-                totaltravel += abs(goaltile[r][c] - selftile[r][c])
-         
-        return totaltravel
+        # the sum is kept up to date by move_blank
+        return self.manhattan
 
+    # helper function for heuristic 3
+    def linear_conflicts(self):
+        """ returns the extra moves beyond the Manhattan distance needed by
+            tiles in their goal row or column but in the wrong order
+        """
+        return self.tables.linear_conflicts(self.tile_list())
  
     # function 7
     def __eq__(self, other):
@@ -201,7 +350,221 @@ class Board:
         """
         # tests if the tiles in self.tiles is equal to the tiles in other.tiles
         return self.tiles == other.tiles    
-        
+
+    def __hash__(self):
+        """ returns a hash of the Board object that is consistent with __eq__
+        """
+        return hash(self.key())
+
+    def key(self):
+        """ returns a hashable value that identifies the configuration of
+            the Board object
+        """
+        return self.digit_string()
+
+    def is_goal(self):
+        """ returns a boolean value of whether or not the Board object is in
+            the goal configuration
+        """
+        return self.tiles == self.tables.goal_tiles
+
+    @property
+    def size(self):
+        """ returns the number of rows and columns of the board
+        """
+        return self.tables.size
+
+    def goal(self):
+        """ returns a new Board object of the same size in the goal state
+        """
+        return Board(self.tables.goal_digits)
+
+    def tile_list(self):
+        """ returns a new list of the tiles in row-major order
+        """
+        return [tile for row in self.tiles for tile in row]
+
+    def is_solvable(self):
+        """ returns a boolean value of whether or not the goal state can be
+            reached from the Board object
+        """
+        return is_solvable(self.tile_list(), self.tables.size)
+
+
+class PackedBoard:
+    """ A class for objects that represent an n x n board as a single
+        integer with a few bits per cell (see SizeTables) plus the index of
+        the blank. It supports the same methods as Board, so State, the
+        searchers and the heuristics can use either one.
+    """
+    __slots__ = ('tables', 'packed', 'blank', 'misplaced', 'manhattan')
+
+    def __init__(self, digitstr):
+        """ a constructor for a PackedBoard object whose configuration
+            is specified by the input digitstr
+            input: digitstr is a digitstr accepted by Board
+        """
+        cells = parse_digitstr(digitstr)
+        self.tables = get_tables(math.isqrt(len(cells)))
+
+        self.packed = self.tables.pack(cells)
+        # the blank is stored as a cell index
+        self.blank = cells.index(0)
+
+        # the heuristic values are kept up to date like Board's
+        self.misplaced = 0
+        self.manhattan = 0
+        for i in range(len(cells)):
+            self.misplaced += self.tables.misplaced[cells[i]][i]
+            self.manhattan += self.tables.manhattan[cells[i]][i]
+
+    def __repr__(self):
+        """ Returns a string representation for a PackedBoard object.
+        """
+        # uses the same layout as Board.__repr__
+        board = ""
+        size = self.tables.size
+        width = len(str(self.tables.cells - 1))
+        for i, tile in enumerate(self.tile_list()):
+            if tile == 0:
+                board += ("_".rjust(width) + " ")
+            else:
+                board += (str(tile).rjust(width) + " ")
+            if i % size == size - 1:
+                board += ("\n")
+
+        return board
+
+    @property
+    def tiles(self):
+        """ returns a new 2-D list of the tiles, as stored by Board
+        """
+        size = self.tables.size
+        cells = self.tile_list()
+        return [cells[size*r:size*r + size] for r in range(size)]
+
+    @property
+    def size(self):
+        """ returns the number of rows and columns of the board
+        """
+        return self.tables.size
+
+    @property
+    def blank_r(self):
+        """ returns the row of the blank
+        """
+        return self.blank // self.tables.size
+
+    @property
+    def blank_c(self):
+        """ returns the column of the blank
+        """
+        return self.blank % self.tables.size
+
+    def move_blank(self, direction):
+        """ returns a boolean value of whether or not the blank can be moved
+            in the input direction, and moves the blank
+            input direction: an approriate direction string or move code
+        """
+        tables = self.tables
+        targets = tables.move_targets.get(direction)
+        # returns False if input is not a direction string or move code
+        if targets == None:
+            return False
+
+        target = targets[self.blank]
+        # returns False if the blank would leave the board
+        if target == -1:
+            return False
+
+        # the blank cell holds 0, so the tile can be moved into it by
+        # adding it at the blank's offset and subtracting it at its own
+        shifts = tables.shifts
+        tile = (self.packed >> shifts[target]) & tables.cell_mask
+        self.packed += (tile << shifts[self.blank]) - (tile << shifts[target])
+        self.misplaced += tables.misplaced[tile][self.blank] - tables.misplaced[tile][target]
+        self.manhattan += tables.manhattan[tile][self.blank] - tables.manhattan[tile][target]
+        self.blank = target
+        return True
+
+    def digit_string(self):
+        """ returns a new digitstr of the current PackedBoard object
+        """
+        return ''.join([TILE_CHARS[tile] for tile in self.tile_list()])
+
+    def copy(self):
+        """ returns a copy of the PackedBoard object without parsing a
+            digit string
+        """
+        copy = PackedBoard.__new__(PackedBoard)
+        copy.tables = self.tables
+        copy.packed = self.packed
+        copy.blank = self.blank
+        copy.misplaced = self.misplaced
+        copy.manhattan = self.manhattan
+        return copy
+
+    def num_misplaced(self):
+        """ returns an integer of how many misplaced cells there are in the
+            board from the goal state
+        """
+        return self.misplaced
+
+    def manhattangeo(self):
+        """ returns a the sum of all the distances each tile needs to travel
+            in order to get to the goal state
+        """
+        return self.manhattan
+
+    def linear_conflicts(self):
+        """ returns the extra moves beyond the Manhattan distance needed by
+            tiles in their goal row or column but in the wrong order
+        """
+        return self.tables.linear_conflicts(self.tile_list())
+
+    def __eq__(self, other):
+        """ returns a boolean if the self PackedBoard object is the same as
+            the other PackedBoard object
+            input other: a PackedBoard object
+        """
+        return self.packed == other.packed
+
+    def __hash__(self):
+        """ returns a hash of the PackedBoard object
+        """
+        return hash(self.packed)
+
+    def key(self):
+        """ returns a hashable value that identifies the configuration of
+            the PackedBoard object
+        """
+        return self.packed
+
+    def is_goal(self):
+        """ returns a boolean value of whether or not the PackedBoard object
+            is in the goal configuration
+        """
+        return self.packed == self.tables.goal_packed
+
+    def goal(self):
+        """ returns a new PackedBoard object of the same size in the goal
+            state
+        """
+        return PackedBoard(self.tables.goal_digits)
+
+    def tile_list(self):
+        """ returns a new list of the tiles in row-major order
+        """
+        packed = self.packed
+        mask = self.tables.cell_mask
+        return [(packed >> shift) & mask for shift in self.tables.shifts]
+
+    def is_solvable(self):
+        """ returns a boolean value of whether or not the goal state can be
+            reached from the PackedBoard object
+        """
+        return is_solvable(self.tile_list(), self.tables.size)
+
 if __name__ == "__main__":
     
     # test cases for functions 1 - 6
@@ -240,3 +603,29 @@ if __name__ == "__main__":
     print("")
     b = Board('142358607')
     print(b.digit_string())
+    print("")
+    # test cases for PackedBoard
+    p = PackedBoard('142358607')
+    print(p)
+    print(p.move_blank('up'))
+    print(p.digit_string())
+    print(p.move_blank('left'))
+    print(p.tiles)
+    p2 = p.copy()
+    p2.move_blank('right')
+    print(p == p2, p.num_misplaced(), p.manhattangeo())
+    print(PackedBoard('012345678').is_goal())
+    print("")
+    # test cases for the Fifteen Puzzle
+    b = Board('123456789abcdef0')
+    print(b)
+    print(b.is_solvable(), b.num_misplaced(), b.manhattangeo())
+    print(b.move_blank('left'), b.move_blank('up'))
+    print(b.digit_string())
+    p = PackedBoard(b.digit_string())
+    print(p.tiles == b.tiles, p.manhattangeo() == b.manhattangeo())
+    print(Board('0123456789abcdef').is_goal(), p.goal().is_goal())
+    print("")
+    # test cases for linear conflicts: 2 and 1 are swapped in their goal row
+    print(Board('021345678').linear_conflicts(), PackedBoard('210345678').linear_conflicts())
+    print(Board('0321456789abcdef').linear_conflicts())
@@ -0,0 +1,136 @@
+import time
+
+class BudgetExhausted(Exception):
+    """ raised inside a search when one of the limits of its Budget runs out.
+        It carries how far the search got, so the caller can report it.
+    """
+    def __init__(self, reason, limit, num_tested, frontier, seconds):
+        """ a constructor for a BudgetExhausted object
+            inputs:
+              * reason - 'expansions', 'time' or 'frontier'
+              * limit - the limit that ran out
+              * num_tested - the states tested so far
+              * frontier - the states waiting to be tested
+              * seconds - the seconds since the search started
+        """
+        super().__init__(reason, limit, num_tested, frontier, seconds)
+        self.reason = reason
+        self.limit = limit
+        self.num_tested = num_tested
+        self.frontier = frontier
+        self.seconds = seconds
+
+    def __str__(self):
+        """ returns a string that describes which limit ran out and when
+        """
+        names = {'expansions': 'expansion limit', 'time': 'time limit',
+                 'frontier': 'frontier limit'}
+        return (f'{names[self.reason]} of {self.limit} reached after ' +
+                f'{self.num_tested} states tested, {self.frontier} in the frontier, ' +
+                f'{self.seconds:.2f} seconds')
+
+    def report(self):
+        """ returns a dictionary of the exception's values, which can be
+            written as JSON
+        """
+        return {'reason': self.reason, 'limit': self.limit, 'num_tested': self.num_tested,
+                'frontier': self.frontier, 'seconds': self.seconds}
+
+class Budget:
+    """ A class for objects that hold the limits of a search: the states it
+        may test, the seconds it may take and the states it may keep waiting
+        in its frontier. A searcher whose budget attribute is None has no
+        limits and skips every check.
+    """
+    def __init__(self, max_expansions = None, time_limit = None, max_frontier = None):
+        """ a constructor for a Budget object, where None means no limit
+            inputs:
+              * max_expansions - the most states the search may test
+              * time_limit - the most seconds the search may take
+              * max_frontier - the most states the search may keep waiting
+                to be tested, which bounds its memory
+        """
+        self.max_expansions = max_expansions
+        self.time_limit = time_limit
+        self.max_frontier = max_frontier
+        self.start_time = None
+        self.deadline = None
+
+    def __repr__(self):
+        """ returns a string representation of the Budget object
+        """
+        return (f'Budget(max_expansions={self.max_expansions}, ' +
+                f'time_limit={self.time_limit}, max_frontier={self.max_frontier})')
+
+    def start(self):
+        """ starts the clock of a new search
+        """
+        self.start_time = time.perf_counter()
+        self.deadline = None
+        if self.time_limit != None:
+            self.deadline = self.start_time + self.time_limit
+
+    def check(self, num_tested, frontier):
+        """ raises BudgetExhausted if a limit has run out. A searcher calls
+            it just before it expands a state, once that state is counted,
+            so max_expansions=N lets exactly N states be expanded.
+            inputs:
+              * num_tested - the states the search has tested, counting the
+                one it is about to expand
+              * frontier - the states waiting to be tested
+        """
+        now = time.perf_counter()
+        if self.max_expansions != None and num_tested > self.max_expansions:
+            raise BudgetExhausted('expansions', self.max_expansions, num_tested,
+                                  frontier, now - self.start_time)
+        if self.deadline != None and now > self.deadline:
+            raise BudgetExhausted('time', self.time_limit, num_tested,
+                                  frontier, now - self.start_time)
+        if self.max_frontier != None and frontier > self.max_frontier:
+            raise BudgetExhausted('frontier', self.max_frontier, num_tested,
+                                  frontier, now - self.start_time)
+
+    def merged(self, other):
+        """ returns a new Budget object whose limits are the ones of other,
+            or of this budget where other has none
+            input other: a Budget object, or None
+        """
+        if other == None:
+            return Budget(self.max_expansions, self.time_limit, self.max_frontier)
+        budget = Budget(self.max_expansions, self.time_limit, self.max_frontier)
+        if other.max_expansions != None:
+            budget.max_expansions = other.max_expansions
+        if other.time_limit != None:
+            budget.time_limit = other.time_limit
+        if other.max_frontier != None:
+            budget.max_frontier = other.max_frontier
+        return budget
+
+# the name of each limit in a line of a puzzle file, and its type
+BUDGET_FIELDS = {'max_expansions': int, 'time_limit': float, 'max_frontier': int}
+
+def parse_budget(words):
+    """ returns a Budget object made from the input name=value words, or
+        None if there are none, raising ValueError for an unknown name or a
+        value of the wrong type. Words without '=' are ignored, and so are
+        all the words from one that starts with '#', so a line may end with
+        a comment.
+        input words: a list of strings such as 'time_limit=2.5'
+    """
+    budget = None
+    for word in words:
+        if word.startswith('#'):
+            break
+        name, sep, value = word.partition('=')
+        if sep == '':
+            continue
+        if name not in BUDGET_FIELDS:
+            raise ValueError(f'unknown budget field: {word}')
+        try:
+            value = BUDGET_FIELDS[name](value)
+        except ValueError:
+            raise ValueError(f'not a valid value for {name}: {value}')
+        if budget == None:
+            budget = Budget()
+        setattr(budget, name, value)
+    return budget
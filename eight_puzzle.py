@@ -1,8 +1,18 @@
 from searcher import *
 from timer import *
+from search_stats import *
+import json
 import math
+import time
+import itertools
+import multiprocessing
+from collections import OrderedDict
+from sweep import solve_all
+from solution_cache import *
+from results import *
 
-def create_searcher(algorithm, depth_limit = -1, heuristic = None):
+def create_searcher(algorithm, depth_limit = -1, heuristic = None,
+                    graph_search = False, budget = None):
     """ a function that creates and returns an appropriate
         searcher object, based on the specified inputs. 
         inputs:
@@ -12,6 +22,9 @@ def create_searcher(algorithm, depth_limit = -1, heuristic = None):
             specify a depth limit 
           * heuristic - an optional parameter that can be used to pass
             in a heuristic function
+          * graph_search - an optional parameter that can be used to prune
+            every board that has already been seen, not only cycles
+          * budget - an optional Budget object that limits the search
             
         Note: If an unknown value is passed in for the algorithm parameter,
         the function returns None.
@@ -19,23 +32,39 @@ def create_searcher(algorithm, depth_limit = -1, heuristic = None):
     searcher = None
     
     if algorithm == 'random':
-        searcher = Searcher(depth_limit)
+        searcher = Searcher(depth_limit, graph_search)
 ## You will uncommment the following lines as you implement
 ## other algorithms.
     elif algorithm == 'BFS':
-        searcher = BFSearcher(depth_limit)
+        searcher = BFSearcher(depth_limit, graph_search)
     elif algorithm == 'DFS':
-        searcher = DFSearcher(depth_limit)
+        searcher = DFSearcher(depth_limit, graph_search)
+    elif algorithm == 'IDDFS':
+        searcher = IDDFSearcher(depth_limit)
     elif algorithm == 'Greedy':
-        searcher = GreedySearcher(depth_limit, heuristic)
+        searcher = GreedySearcher(depth_limit, heuristic, graph_search)
     elif algorithm == 'A*':
-        searcher = AStarSearcher(depth_limit, heuristic)
+        searcher = AStarSearcher(depth_limit, heuristic, graph_search)
+    elif algorithm == 'IDA*':
+        searcher = IDAStarSearcher(depth_limit, heuristic)
+    elif algorithm == 'anytime':
+        searcher = AnytimeSearcher(depth_limit, heuristic)
+    elif algorithm == 'oracle':
+        searcher = OracleSearcher(depth_limit)
+    elif algorithm == 'BiBFS':
+        searcher = BidirectionalSearcher(depth_limit)
+    elif algorithm == 'sweep':
+        searcher = SweepSearcher(depth_limit)
     else:  
         print('unknown algorithm:', algorithm)
 
+    if searcher != None:
+        searcher.budget = budget
     return searcher
 
-def eight_puzzle(init_boardstr, algorithm, depth_limit = -1, heuristic = None):
+def eight_puzzle(init_boardstr, algorithm, depth_limit = -1, heuristic = None,
+                 board_class = PackedBoard, graph_search = False, stats = None,
+                 budget = None, solution_cache = None):
     """ a driver function for solving Eight Puzzles using state-space search
         inputs:
           * init_boardstr - a string of digits specifying the configuration
@@ -45,13 +74,46 @@ def eight_puzzle(init_boardstr, algorithm, depth_limit = -1, heuristic = None):
             specify a depth limit 
           * heuristic - an optional parameter that can be used to pass
             in a heuristic function
+          * board_class - an optional parameter that can be used to pick
+            the board representation (PackedBoard, the default,
+            or Board)
+          * graph_search - an optional parameter that can be used to prune
+            every board that has already been seen
+          * stats - an optional SearchStats object that collects what the
+            search does; its report is printed, and stats.report() returns
+            it as a dictionary
+          * budget - an optional Budget object that stops the search when
+            one of its limits runs out
+          * solution_cache - an optional SolutionCache object; a solution
+            it has for the board, algorithm and heuristic is shown without
+            searching, and a new solution is added to it
     """
-    init_board = Board(init_boardstr)
+    init_board = board_class(init_boardstr)
     init_state = State(init_board, None, 'init')
 
-    searcher = create_searcher(algorithm, depth_limit, heuristic)
+    # rejects a board with odd inversion parity before searching, since
+    # the search would only stop after trying half of all boards
+    if not init_board.is_solvable():
+        print('No solution: the goal cannot be reached from this board.')
+        return
+
+    # looks for a solution from an earlier run before creating the searcher
+    key = init_board.digit_string()
+    if solution_cache != None:
+        cached = solution_cache.lookup([key], algorithm, heuristic, depth_limit)
+        if key in cached:
+            soln = init_state.apply_moves(cached[key])
+            print('Found a solution requiring', soln.num_moves,
+                  'moves in the solution cache.')
+            show_steps = input('Show the moves (y/n)? ')
+            if show_steps == 'y':
+                soln.print_moves_to()
+            return
+
+    searcher = create_searcher(algorithm, depth_limit, heuristic, graph_search, budget)
     if searcher == None:
         return
+    searcher.stats = stats
 
     soln = None
     timer = Timer(algorithm)
@@ -61,76 +123,492 @@ def eight_puzzle(init_boardstr, algorithm, depth_limit = -1, heuristic = None):
         soln = searcher.find_solution(init_state)
     except KeyboardInterrupt:
         print('Search terminated.')
+    except BudgetExhausted as exhausted:
+        print('Search stopped: ' + str(exhausted) + '.')
+        if stats != None:
+            stats.finish()
+    except ValueError as e:
+        print('Cannot search this board: ' + str(e) + '.')
+        return
 
     timer.end()
     print(str(timer) + ', ', end='')
     print(searcher.num_tested, 'states')
+    # reports the threshold and states tested of each iteration
+    if algorithm == 'IDA*':
+        for threshold, num_tested in searcher.iterations:
+            print(f'  threshold {threshold}: {num_tested} states')
+    if algorithm == 'IDDFS':
+        for depth, num_tested in searcher.iterations:
+            print(f'  depth {depth}: {num_tested} states')
+    # reports each shorter solution of an anytime search
+    if algorithm == 'anytime':
+        for weight, num_moves, num_tested in searcher.solutions:
+            print(f'  weight {weight}: {num_moves} moves after {num_tested} states')
+        if searcher.optimal:
+            print('  the last solution is optimal')
+    if stats != None:
+        print_stats(stats)
 
     if soln == None:
         print('Failed to find a solution.')
     else:
         print('Found a solution requiring', soln.num_moves, 'moves.')
+        if solution_cache != None:
+            solution_cache.store({key: soln.move_codes()}, algorithm, heuristic)
         show_steps = input('Show the moves (y/n)? ')
         if show_steps == 'y':
             soln.print_moves_to()
 
-def process_file(filename, algorithm, depth_limit = -1, heuristic = None):
-    """ returns a string of results that report the amount of moves and states
-        the input algorithm takes on each line of puzzles from the filename
-        input filename: a file with digitstrs
-        input algorithm: an appropriate algorithm name
+def print_stats(stats):
+    """ prints the report of the input SearchStats object, or a note if the
+        searcher has no instrumentation hooks
+    """
+    if stats.start_time == None:
+        print('search statistics: this searcher has no instrumentation hooks')
+    else:
+        print(stats, end='')
+
+def solve_board(digitstr, algorithm, depth_limit = -1, heuristic = None,
+                board_class = PackedBoard, graph_search = False, timeout = None,
+                cache_size = None, instrument = False, budget = None):
+    """ searches for a solution to one board and returns a SolveResult
+        object whose status is 'solved', 'no solution', 'terminated',
+        'invalid' (the algorithm or heuristic does not cover the size of
+        the board), or 'budget exhausted' followed by the limit that ran out
+        in parentheses, with the heuristic cache hits and misses of this
+        search and its search statistics when they were collected
+        inputs:
+          * digitstr - the digitstr of the board
+          * algorithm, depth_limit, heuristic, board_class, graph_search -
+            the same as for process_file
+          * timeout - an optional number of seconds after which the search
+            is stopped, which overrides the time limit of budget
+          * cache_size - an optional number of boards whose heuristic values
+            are remembered by this process's cache of the heuristic
+          * instrument - True to collect the search statistics
+          * budget - an optional Budget object that limits the search
+    """
+    s = State(board_class(digitstr), None, 'init')
+    cache = None
+    if cache_size != None and heuristic != None:
+        cache = get_heuristic_cache(heuristic, cache_size)
+        heuristic = cache
+        hits = cache.hits
+        misses = cache.misses
+    # a timeout is a time limit, set on a copy so the caller's budget is
+    # unchanged
+    if timeout != None:
+        budget = Budget().merged(budget)
+        budget.time_limit = timeout
+    searcher = create_searcher(algorithm, depth_limit, heuristic, graph_search, budget)
+    stats = None
+    if instrument:
+        stats = SearchStats()
+        searcher.stats = stats
+
+    soln = None
+    status = 'no solution'
+    error = None
+    start = time.perf_counter()
+    try:
+        soln = searcher.find_solution(s)
+    # for example if the algorithms is taking too long
+    except KeyboardInterrupt:
+        status = 'terminated'
+    except BudgetExhausted as exhausted:
+        status = 'budget exhausted (' + exhausted.reason + ')'
+        if stats != None:
+            stats.finish()
+    # the distance oracle and the pattern databases only cover some sizes
+    # of board, which is reported like any other line that cannot be solved
+    except ValueError as e:
+        status = 'invalid'
+        error = str(e)
+        if stats != None:
+            stats.finish()
+
+    seconds = time.perf_counter() - start
+
+    if soln == None:
+        result = SolveResult(digitstr, status, None, searcher.num_tested, seconds)
+        result.error = error
+    else:
+        result = SolveResult(digitstr, 'solved', soln.num_moves, searcher.num_tested,
+                             seconds, soln.move_codes())
+    if cache != None:
+        result.cache_counts = [cache.hits - hits, cache.misses - misses]
+    # searchers without hooks never start the stats
+    if stats != None and stats.start_time != None:
+        result.report = stats.report()
+    return result
+
+def solve_task(task):
+    """ calls solve_board with the input tuple of arguments, so a process
+        pool can send it to a worker
+    """
+    return solve_board(*task)
+
+
+def read_lines(source):
+    """ yields the words of each non-empty line of the input source joined
+        with single spaces, reading one line at a time
+        input source: a file name, or an iterable of lines such as an open
+        file or a list of strings
+    """
+    f = None
+    if type(source) == str:
+        f = open(source, 'r')
+        source = f
+    try:
+        for line in source:
+            if line.strip() != '':
+                yield ' '.join(line.split())
+    finally:
+        if f != None:
+            f.close()
+
+def solve_stream(source, algorithm, depth_limit = -1, heuristic = None,
+                 board_class = PackedBoard, graph_search = False, workers = 1,
+                 chunksize = None, timeout = None, cache_size = None,
+                 instrument = False, budget = None, triage = False,
+                 solution_cache = None, chunk_lines = 10000, remember = 100000):
+    """ a generator that reads the lines of puzzles from the input source
+        chunk_lines at a time and yields a SolveResult object for each line,
+        in the order of the lines, so that a batch of any length can be
+        solved without keeping its lines or results in memory
+        inputs:
+          * source - a file name, or an iterable of lines, with a digitstr
+            at the start of each line, optionally followed by limits for
+            that line's search, such as
+            806547231 max_expansions=5000 time_limit=2.5 max_frontier=100000
+          * algorithm, depth_limit, heuristic, board_class, graph_search,
+            workers, chunksize, timeout, cache_size, budget, triage,
+            solution_cache - the same as for process_file, where the
+            triage, the lookups in the solution cache and the sweep of
+            'sweep' are done once per chunk
+          * instrument - True to collect the search statistics of each board
+          * chunk_lines - the number of lines read and planned at a time
+          * remember - the number of recent results kept to answer
+            duplicate lines, the least recently used being forgotten first
+    """
+    lines = read_lines(source)
+    # the results of the lines seen so far, by line
+    remembered = OrderedDict()
+    pool = None
+    done = False
+    try:
+        while True:
+            chunk = list(itertools.islice(lines, chunk_lines))
+            if len(chunk) == 0:
+                break
+            # the results of earlier chunks for the lines of this one, taken
+            # now so that they cannot be forgotten before they are used
+            earlier = {}
+            for line in chunk:
+                if line in remembered:
+                    earlier[line] = remembered[line]
+
+            # finds whether or not each digitstr can be solved and, with
+            # triage, its Manhattan distance, which no solution can be
+            # shorter than
+            solvable = {}
+            distances = {}
+            # the lines that cannot be read, mapped to why, which are
+            # reported instead of stopping the batch
+            errors = {}
+            invalid = set()
+            digitstrs = list(dict.fromkeys([line.split()[0] for line in chunk
+                                            if line not in earlier]))
+            if triage:
+                # each batch holds the boards of one size
+                for length in set([len(digitstr) for digitstr in digitstrs]):
+                    group = [digitstr for digitstr in digitstrs if len(digitstr) == length]
+                    try:
+                        tiles = tile_array(group)
+                    # leaves out the boards that are not valid, one at a time
+                    except (AssertionError, ValueError):
+                        valid = []
+                        for digitstr in group:
+                            try:
+                                parse_digitstr(digitstr)
+                                valid += [digitstr]
+                            except AssertionError:
+                                invalid.add(digitstr)
+                        group = valid
+                        if len(group) == 0:
+                            continue
+                        tiles = tile_array(group)
+                    for digitstr, ok, distance in zip(group, solvable_batch(tiles),
+                                                      manhattan_batch(tiles)):
+                        solvable[digitstr] = ok
+                        distances[digitstr] = distance
+            else:
+                for digitstr in digitstrs:
+                    try:
+                        solvable[digitstr] = board_class(digitstr).is_solvable()
+                    except AssertionError:
+                        invalid.add(digitstr)
+
+            # finds the boards that need a search: the first copy of each
+            # solvable board with the same limits that is not too far for
+            # the depth limit, in the order of the lines
+            seen = set()
+            tasks = []
+            task_lines = []
+            for line in chunk:
+                if line not in seen and line not in earlier:
+                    seen.add(line)
+                    words = line.split()
+                    if words[0] in invalid:
+                        errors[line] = f'not a valid board: {words[0]}'
+                        continue
+                    try:
+                        line_budget = parse_budget(words[1:])
+                    except ValueError as e:
+                        errors[line] = str(e)
+                        continue
+                    if solvable[words[0]] and not (depth_limit != -1 and triage and
+                                                   distances[words[0]] > depth_limit):
+                        if budget != None:
+                            line_budget = budget.merged(line_budget)
+                        tasks += [(words[0], algorithm, depth_limit, heuristic,
+                                   board_class, graph_search, timeout, cache_size,
+                                   instrument, line_budget)]
+                        task_lines += [line]
+
+            # the results of the tasks that are done but not yielded yet,
+            # by line
+            finished = {}
+            # answers the boards that the solution cache has solutions for,
+            # looking them all up at once, and only searches the others
+            keys = {}
+            if solution_cache != None:
+                for task in tasks:
+                    keys[task[0]] = board_class(task[0]).digit_string()
+                cached = solution_cache.lookup(list(keys.values()), algorithm,
+                                               heuristic, depth_limit)
+                remaining = []
+                remaining_lines = []
+                for task, line in zip(tasks, task_lines):
+                    moves = cached.get(keys[task[0]])
+                    if moves == None:
+                        remaining += [task]
+                        remaining_lines += [line]
+                    else:
+                        finished[line] = SolveResult(line, 'solved', len(moves), 0, 0.0, moves)
+                        finished[line].cached = True
+                tasks = remaining
+                task_lines = remaining_lines
+
+            # the boards that are farthest from the goal usually take the
+            # longest, so starting them first keeps every worker busy until
+            # the end
+            if triage and workers > 1:
+                order = sorted(range(len(tasks)), key=lambda i: -distances[tasks[i][0]])
+                tasks = [tasks[i] for i in order]
+                task_lines = [task_lines[i] for i in order]
+
+            # both map and imap return the results lazily and in the order
+            # of the tasks, so each line is yielded as soon as it and every
+            # line before it are done
+            if algorithm == 'sweep':
+                # one sweep out from the goal per board size answers every
+                # task at once, under the limits of the whole batch
+                sweep_budget = budget
+                if timeout != None:
+                    sweep_budget = Budget().merged(budget)
+                    sweep_budget.time_limit = timeout
+                start = time.perf_counter()
+                swept = solve_all([task[0] for task in tasks], board_class,
+                                  depth_limit, sweep_budget)
+                # each board gets an equal share of the seconds of the sweep
+                seconds = (time.perf_counter() - start) / max(1, len(tasks))
+                for line in task_lines:
+                    status, num_moves, num_tested, moves = swept[line.split()[0]]
+                    finished[line] = SolveResult(line, status, num_moves, num_tested,
+                                                 seconds, moves)
+                solved = iter([])
+            elif workers > 1 and len(tasks) > 0:
+                # the same workers serve every chunk
+                if pool == None:
+                    pool = multiprocessing.Pool(workers)
+                size = chunksize
+                if size == None:
+                    size = max(1, len(tasks) // (workers * 4))
+                solved = pool.imap(solve_task, tasks, size)
+            else:
+                solved = map(solve_task, tasks)
+            next_lines = iter(task_lines)
+
+            # the results of this chunk, by line, and the solutions found
+            # by its searches, by digit string, for the solution cache
+            chunk_results = {}
+            new_solutions = {}
+            for line in chunk:
+                # reuses the result of a board that appeared earlier
+                if line in chunk_results or line in earlier:
+                    original = chunk_results.get(line, earlier.get(line))
+                    # marks the line as just used
+                    remembered.pop(line, None)
+                    remembered[line] = original
+                    if len(remembered) > remember:
+                        remembered.popitem(last=False)
+                    result = original.copy()
+                    result.duplicate = True
+                    yield result
+                    continue
+
+                digitstr = line.split()[0]
+                # reports a line that cannot be read, and goes on
+                if line in errors:
+                    result = SolveResult(line, 'invalid')
+                    result.error = errors[line]
+                # rejects the board without searching if the goal cannot be
+                # reached
+                elif not solvable[digitstr]:
+                    result = SolveResult(line, 'unsolvable')
+                # rules out the board if even its Manhattan distance is too
+                # long
+                elif depth_limit != -1 and triage and distances[digitstr] > depth_limit:
+                    result = SolveResult(line, 'too far')
+                    result.distance = distances[digitstr]
+                else:
+                    while line not in finished:
+                        finished[next(next_lines)] = next(solved)
+                    result = finished.pop(line)
+                    result.line = line
+                    if solution_cache != None and result.status == 'solved' and not result.cached:
+                        new_solutions[keys[digitstr]] = result.moves
+                chunk_results[line] = result
+                remembered[line] = result
+                if len(remembered) > remember:
+                    remembered.popitem(last=False)
+                yield result
+
+            if solution_cache != None:
+                solution_cache.store(new_solutions, algorithm, heuristic)
+        done = True
+    # stops every worker if the batch is interrupted or the stream is
+    # closed before its end
+    finally:
+        if pool != None:
+            if done:
+                pool.close()
+            else:
+                pool.terminate()
+            pool.join()
+
+def process_file(filename, algorithm, depth_limit = -1, heuristic = None,
+                 board_class = PackedBoard, graph_search = False, workers = 1,
+                 chunksize = None, timeout = None, cache_size = None,
+                 stats_file = None, budget = None, triage = False,
+                 solution_cache = None):
+    """ prints the amount of moves and states the input algorithm takes on
+        each line of puzzles from the filename as solve_stream yields it,
+        and then a summary of the batch
+        input filename: a file with a digitstr at the start of each line,
+        optionally followed by limits for that line's search, such as
+        806547231 max_expansions=5000 time_limit=2.5 max_frontier=100000
+        and a '#' comment; a line that cannot be read is reported as
+        invalid and the batch goes on
+        input algorithm: an appropriate algorithm name; 'sweep' solves every
+        board with one breadth-first sweep out from the goal per board size,
+        under budget and timeout for the whole batch instead of the limits
+        on each line, and without workers
         depth_limit: an appropriate depth_limit for algorithms that need it
-        heurisitc: an appropriate heuristic (h0, h1, h2)
+        heurisitc: an appropriate heuristic (h0, h1, h2, h3, or one made by hmax)
+        board_class: the board representation to use (PackedBoard or Board)
+        graph_search: True to prune every board that has already been seen
+        workers: the number of processes that search in parallel
+        chunksize: the number of boards sent to a worker at a time (by
+        default, enough for about four chunks per worker)
+        timeout: an optional number of seconds allowed for each board
+        cache_size: an optional number of boards whose heuristic values are
+        remembered and shared by the searches of each process
+        stats_file: an optional file name; if given, every search collects
+        statistics, their totals are printed, and the report of each board
+        and the totals are written to the file as JSON
+        budget: an optional Budget object that limits every search; the
+        limits on a line replace its limits of the same name
+        triage: True to compute the solvability and Manhattan distance of
+        every board in one batch (with NumPy when it is available), to rule
+        out boards whose distance is over the depth limit without a search,
+        and to send the farthest boards to the workers first
+        solution_cache: an optional SolutionCache object; the boards it has
+        a solution for are answered before any search, and the solutions
+        found by the searches are added to it
     """
-    # opens the filename and reads it
-    f = open(filename, 'r')
-    # creates empty accumulator variables to store the amonut of puzzles tested,
-    # and the average amount of moves and states  
-    puzzles = 0
-    avgm = []
-    avgs = []
-    
-    # loops through each line in the file and uses the input algorithm on it
-    for line in f:
-        # splices the list to get the digitstr
-        line = line[0:9]
-        # creates a Board and State with that digitstr
-        b = Board(line)
-        s = State(b, None, 'init')
-
-        # creates a Searcher from the input attributes
-        searcher = create_searcher(algorithm, depth_limit, heuristic)
-        # returns if it fails to create a searcher
-        if searcher == None:
-            print('Failed to create a searcher.')
-
-        soln = None
-        # stores the solution 
-        try:
-            soln = searcher.find_solution(s)
-        # returns when there is a Keyboard interuption, for example if the
-        # algorithms is taking too long
-        except KeyboardInterrupt:
-            print(f'{line}: search terminated, ', end='')
-        
-        # returns if there is no solution
-        if soln == None:
-            print('no solution')
-        # returns if the searcher finds a solution, formatting the answer to print
-        else:
-            print(f'{line}: {soln.num_moves} moves, {searcher.num_tested} states tested')
-            # adds to the accumulator variables for each puzzle solved
-            puzzles += 1
-            avgm += [soln.num_moves]
-            avgs += [searcher.num_tested]
+    stream = solve_stream(filename, algorithm, depth_limit, heuristic, board_class,
+                          graph_search, workers, chunksize, timeout, cache_size,
+                          stats_file != None, budget, triage, solution_cache)
+    totals = ResultTotals()
+    stored = None
+    if solution_cache != None:
+        stored = solution_cache.stored
+    # the search statistics of each board, by line
+    reports = {}
+
+    # prints each line's result as soon as it arrives
+    try:
+        for result in stream:
+            print(result.text())
+            totals.add(result)
+            if result.report != None and not result.duplicate:
+                reports[result.line] = result.report
+    # the stream stops every worker if the operator interrupts the batch
+    except KeyboardInterrupt:
+        print('Search terminated.')
 
     print('')
-    print(f'solved {puzzles} puzzles')
-    # returns the averages of all the solved puzzles
-    if len(avgm) == 0 or len(avgs) == 0:
-        pass
-    else:
-        print(f'averages: {sum(avgm)/len(avgm)} moves, {sum(avgs)/len(avgs)} states tested')
-    
-         
-        
+    if stored != None:
+        stored = solution_cache.stored - stored
+    for line in totals.summary(stored):
+        print(line)
+
+    if stats_file != None:
+        total = combine_reports(list(reports.values()))
+        print(format_report(total), end='')
+        f = open(stats_file, 'w')
+        json.dump({'total': total, 'boards': reports}, f, indent=1)
+        f.close()
+
+if __name__ == "__main__":
+
+    # test cases for lines with trailing text and lines that cannot be read,
+    # which are reported without stopping the batch
+    print(parse_budget(['#', 'comment']))
+    print(parse_budget(['note', 'max_expansions=5000', '#', 'time_limit=x']).max_expansions)
+    lines = ['142358607 # comment', '142358607 max_expansions=x',
+             '142358607 speed=3', '14235860', '142358607 # comment',
+             '142358607']
+    for triage in [False, True]:
+        totals = ResultTotals()
+        for result in solve_stream(lines, 'A*', -1, h3, triage=triage):
+            print(result.text())
+            totals.add(result)
+        for line in totals.summary():
+            print(line)
+
+    # test cases for max_expansions=N, which lets exactly N states be
+    # expanded: every searcher checks its budget once just before each
+    # expansion, so the checks that pass are the expansions
+    for algorithm in ['random', 'BFS', 'DFS', 'IDDFS', 'Greedy', 'A*', 'IDA*',
+                      'anytime', 'oracle', 'BiBFS', 'sweep']:
+        # the board takes 31 moves, more than the largest limit
+        for n in [1, 2, 20]:
+            budget = Budget(max_expansions=n)
+            searcher = create_searcher(algorithm, -1, h3, False, budget)
+            passed = [0]
+            def check(num_tested, frontier, check=budget.check):
+                check(num_tested, frontier)
+                passed[0] += 1
+            budget.check = check
+            try:
+                searcher.find_solution(State(PackedBoard('806547231'), None, 'init'))
+                assert False, (algorithm, n, 'not stopped')
+            except BudgetExhausted as exhausted:
+                assert passed[0] == n, (algorithm, n, passed[0])
+                assert exhausted.num_tested == searcher.num_tested == n + 1, \
+                       (algorithm, n, exhausted.num_tested, searcher.num_tested)
+    print('max_expansions: ok')
@@ -0,0 +1,145 @@
+from collections import deque
+from state import *
+from tables import *
+
+# the number of orders of the 8 tiles with an even number of inversions,
+# and the number of configurations reachable from the goal
+NUM_TILE_ORDERS = 20160
+NUM_CONFIGS = 9 * NUM_TILE_ORDERS
+
+# the value of the table entries that are never reached
+UNREACHED = 255
+
+# FACTORIALS[i] is i!
+FACTORIALS = [1, 1, 2, 6, 24, 120, 720, 5040, 40320]
+
+def rank(cells):
+    """ returns a tuple of the perfect-hash index of the input tiles and a
+        boolean of whether or not the goal can be reached from them
+        input cells: a list of the 9 tiles in row-major order
+
+        The 8 tiles other than the blank get their Lehmer-code rank. Two
+        orders that only differ in their last two tiles have ranks 2r and
+        2r + 1 and opposite inversion parity, and only the even one can be
+        reached, so rank // 2 numbers the reachable orders 0 to 20159.
+    """
+    blank = cells.index(0)
+    tiles = cells[:blank] + cells[blank + 1:]
+    code = 0
+    inversions = 0
+    for i in range(8):
+        # counts the later tiles that are smaller than tiles[i]
+        smaller = 0
+        for j in range(i + 1, 8):
+            if tiles[j] < tiles[i]:
+                smaller += 1
+        code += smaller * FACTORIALS[7 - i]
+        inversions += smaller
+    return blank * NUM_TILE_ORDERS + code // 2, inversions % 2 == 0
+
+def unrank(index):
+    """ returns the list of 9 tiles whose perfect-hash index is the input
+        input index: an integer from 0 to NUM_CONFIGS - 1
+    """
+    blank, half = divmod(index, NUM_TILE_ORDERS)
+    for code in [2 * half, 2 * half + 1]:
+        # decodes the Lehmer code into an order of the tiles 1-8
+        left = [1, 2, 3, 4, 5, 6, 7, 8]
+        tiles = []
+        inversions = 0
+        for i in range(8):
+            smaller, code = divmod(code, FACTORIALS[7 - i])
+            tiles += [left.pop(smaller)]
+            inversions += smaller
+        # keeps the one of the two orders that can be reached
+        if inversions % 2 == 0:
+            return tiles[:blank] + [0] + tiles[blank:]
+
+def build_table():
+    """ returns a bytearray that maps the index of every configuration
+        reachable from the goal to its exact number of moves from the goal
+    """
+    # walks breadth-first out from the goal over packed integers, which
+    # is much faster than ranking each board as it is generated
+    table = bytearray([UNREACHED]) * NUM_CONFIGS
+    start = PackedBoard('012345678')
+    seen = {start.packed: 0}
+    queue = deque([start])
+    while len(queue) > 0:
+        b = queue.popleft()
+        d = seen[b.packed]
+        for direction in DIRECTIONS:
+            new_b = b.copy()
+            if new_b.move_blank(direction) and new_b.packed not in seen:
+                seen[new_b.packed] = d + 1
+                queue.append(new_b)
+
+    tables = get_tables(3)
+    for packed in seen:
+        cells = [(packed >> shift) & tables.cell_mask for shift in tables.shifts]
+        table[rank(cells)[0]] = seen[packed]
+    return table
+
+class DistanceOracle:
+    """ A class for objects that look up the exact number of moves from
+        any 3x3 board to the goal in a memory-mapped table of 181,440 bytes.
+    """
+    def __init__(self):
+        """ a constructor for a DistanceOracle object, which builds and saves
+            the table the first time it is needed
+        """
+        self.table = load_table('oracle-3x3.bin', build_table)
+
+    def __repr__(self):
+        """ returns a string representation of the DistanceOracle object
+        """
+        return 'DistanceOracle(' + str(len(self.table)) + ' configurations)'
+
+    def distance(self, board):
+        """ returns the fewest moves from the input board to the goal, or None
+            if the goal cannot be reached from it
+            input board: a 3x3 Board or PackedBoard object
+        """
+        if board.size != 3:
+            raise ValueError('the distance oracle only covers 3x3 boards')
+        index, solvable = rank(board.tile_list())
+        if not solvable:
+            return None
+        return self.table[index]
+
+# the DistanceOracle object of this process, once it has been created
+oracles = []
+
+def get_oracle():
+    """ returns the DistanceOracle object of this process, creating it only
+        the first time it is asked for
+    """
+    if len(oracles) == 0:
+        oracles.append(DistanceOracle())
+    return oracles[0]
+
+def check_heuristic(heuristic):
+    """ returns a tuple of the number of reachable configurations on which the
+        input heuristic overestimates the exact distance, and one such
+        digitstr or None
+        input heuristic: a heuristic function that takes a State object
+    """
+    oracle = get_oracle()
+    over = 0
+    example = None
+    for index in range(NUM_CONFIGS):
+        digitstr = ''.join([str(tile) for tile in unrank(index)])
+        state = State(PackedBoard(digitstr), None, 'init')
+        if heuristic(state) > oracle.table[index]:
+            over += 1
+            example = digitstr
+    return over, example
+
+if __name__ == "__main__":
+
+    # builds the table and prints a few distances
+    oracle = get_oracle()
+    print(oracle)
+    for digitstr in ['012345678', '102345678', '142358607', '806547231', '102345687']:
+        print(digitstr, oracle.distance(Board(digitstr)))
+    print(unrank(rank([1, 4, 2, 3, 5, 8, 6, 0, 7])[0]))
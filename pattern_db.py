@@ -0,0 +1,157 @@
+from collections import deque
+from board import *
+from tables import *
+
+# the disjoint groups of tiles used by the default pattern database of each
+# board size; the 4x4 groups are kept to four tiles so that each table can
+# be built in a few seconds
+DEFAULT_PATTERNS = {3: [(1, 2, 3, 4), (5, 6, 7, 8)],
+                    4: [(1, 2, 3, 4), (5, 6, 7, 8), (9, 10, 11, 12), (13, 14, 15)]}
+
+# the value of the table entries that no abstract state reaches
+UNREACHED = 255
+
+def table_name(pattern, size = 3):
+    """ returns the name of the table file of the input group of tiles
+        inputs:
+          * pattern - a tuple of tiles
+          * size - the number of rows and columns of the board
+    """
+    return f'pdb-{size}x{size}-' + '-'.join([str(tile) for tile in pattern]) + '.bin'
+
+def build_table(pattern, size = 3):
+    """ returns a bytearray that maps the cells of the tiles in the input
+        group to the fewest moves of those tiles needed to reach the goal
+        inputs:
+          * pattern - a tuple of tiles
+          * size - the number of rows and columns of the board
+
+        Entry sum(cell of pattern[j] * cells**j) holds the distance. Only
+        the pattern's tiles and the blank are tracked, and moves of the
+        other tiles are free, so databases of disjoint groups can be added.
+    """
+    num_cells = size * size
+    targets = get_tables(size).move_targets
+    k = len(pattern)
+    table_size = num_cells ** k
+    weights = [num_cells ** j for j in range(k)]
+    table = bytearray([UNREACHED]) * table_size
+
+    # an abstract state is (table index) * num_cells + (cell of the blank),
+    # and its cost is the number of pattern tile moves; moving the blank
+    # onto a pattern tile costs 1 and onto any other tile costs 0, so a 0-1
+    # breadth-first search from the goal finds every distance
+    dist = bytearray([UNREACHED]) * (table_size * num_cells)
+    done = bytearray(table_size * num_cells)
+    start = sum([tile * weights[j] for j, tile in enumerate(pattern)]) * num_cells
+    dist[start] = 0
+    queue = deque([start])
+
+    while len(queue) > 0:
+        state = queue.popleft()
+        if done[state]:
+            continue
+        done[state] = 1
+        index, blank = divmod(state, num_cells)
+        d = dist[state]
+        # states leave the queue in order of cost, so the first one with a
+        # given index has the fewest moves over all cells of the blank
+        if table[index] == UNREACHED:
+            table[index] = d
+
+        cells = [(index // weights[j]) % num_cells for j in range(k)]
+        for direction in DIRECTIONS:
+            target = targets[direction][blank]
+            if target == -1:
+                continue
+            if target in cells:
+                # the pattern tile at target slides into the blank's cell
+                j = cells.index(target)
+                new_state = (index + (blank - target) * weights[j]) * num_cells + target
+                if d + 1 < dist[new_state]:
+                    dist[new_state] = d + 1
+                    queue.append(new_state)
+            else:
+                new_state = index * num_cells + target
+                if d < dist[new_state]:
+                    dist[new_state] = d
+                    queue.appendleft(new_state)
+
+    return table
+
+class PatternDatabase:
+    """ A class for objects that estimate the moves left on a board by
+        adding up the memory-mapped tables of disjoint groups of tiles.
+    """
+    def __init__(self, patterns = None, size = 3):
+        """ a constructor for a PatternDatabase object, which builds and
+            saves the table of each group the first time it is needed
+            inputs:
+              * patterns - a list of disjoint tuples of tiles, or None for
+                the DEFAULT_PATTERNS of the size
+              * size - the number of rows and columns of the boards
+        """
+        if patterns == None:
+            if size not in DEFAULT_PATTERNS:
+                raise ValueError(f'no default pattern database for {size}x{size} boards')
+            patterns = DEFAULT_PATTERNS[size]
+        tiles = [tile for pattern in patterns for tile in pattern]
+        assert(len(tiles) == len(set(tiles)))
+        assert(0 not in tiles and max(tiles) < size * size)
+
+        self.size = size
+        self.patterns = [tuple(pattern) for pattern in patterns]
+        self.tables = []
+        for pattern in self.patterns:
+            self.tables += [load_table(table_name(pattern, size),
+                                       lambda pattern=pattern: build_table(pattern, size))]
+
+    def __repr__(self):
+        """ returns a string representation of the PatternDatabase object
+        """
+        return f'PatternDatabase({self.patterns}, size={self.size})'
+
+    def distance(self, board):
+        """ returns the sum of the table entries of every group of tiles
+            input board: a Board or PackedBoard object of the database's size
+        """
+        # finds the cell of each tile
+        num_cells = self.size * self.size
+        cells = [0] * num_cells
+        i = 0
+        for tile in board.tile_list():
+            cells[tile] = i
+            i += 1
+
+        total = 0
+        for pattern, table in zip(self.patterns, self.tables):
+            index = 0
+            for tile in reversed(pattern):
+                index = index * num_cells + cells[tile]
+            total += table[index]
+        return total
+
+# the PatternDatabase objects created so far, keyed by their size and groups
+# of tiles
+databases = {}
+
+def get_database(patterns = None, size = 3):
+    """ returns the PatternDatabase object of the input groups of tiles,
+        creating it only the first time it is asked for in this process
+        inputs:
+          * patterns - a list of disjoint tuples of tiles, or None for the
+            DEFAULT_PATTERNS of the size
+          * size - the number of rows and columns of the boards
+    """
+    key = (size, None if patterns == None else tuple([tuple(p) for p in patterns]))
+    if key not in databases:
+        databases[key] = PatternDatabase(patterns, size)
+    return databases[key]
+
+if __name__ == "__main__":
+
+    # builds the default tables and prints a few distances
+    pdb = get_database()
+    print(pdb)
+    for digitstr in ['012345678', '102345678', '142358607', '806547231']:
+        print(digitstr, pdb.distance(PackedBoard(digitstr)))
@@ -0,0 +1,243 @@
+import csv
+import json
+from state import *
+
+class SolveResult:
+    """ A class for the record of what happened to one line of a batch of
+        puzzles. The status is 'solved', 'no solution', 'unsolvable' (the
+        goal cannot be reached), 'too far' (the Manhattan distance is over
+        the depth limit), 'invalid' (the line could not be read), 'terminated',
+        or 'budget exhausted' followed by the limit that ran out in
+        parentheses.
+    """
+    __slots__ = ('line', 'digitstr', 'status', 'num_moves', 'num_tested',
+                 'seconds', 'moves', 'cache_counts', 'report', 'distance',
+                 'duplicate', 'cached', 'error')
+
+    def __init__(self, line, status, num_moves = None, num_tested = 0,
+                 seconds = 0.0, moves = None):
+        """ a constructor for a SolveResult object
+            inputs:
+              * line - the line of the batch, a digitstr and its limits
+              * status - the status of the line, as described above
+              * num_moves - the number of moves of the solution, or None
+              * num_tested - the number of states tested by the search
+              * seconds - the seconds the search took
+              * moves - the list of move codes of the solution, or None
+        """
+        self.line = line
+        self.digitstr = line.split()[0]
+        self.status = status
+        self.num_moves = num_moves
+        self.num_tested = num_tested
+        self.seconds = seconds
+        self.moves = moves
+        # a list of the heuristic cache hits and misses of the search, its
+        # search statistics, and the Manhattan distance of the board when
+        # it was ruled out by it, or None for each
+        self.cache_counts = None
+        self.report = None
+        self.distance = None
+        # True if the result was copied from an earlier line with the same
+        # board and limits, and if the solution came from a SolutionCache
+        self.duplicate = False
+        self.cached = False
+        # why the line is invalid, or None
+        self.error = None
+
+    def __repr__(self):
+        """ returns a string representation of the SolveResult object
+        """
+        return 'SolveResult(' + json.dumps(self.record()) + ')'
+
+    def copy(self):
+        """ returns a copy of the SolveResult object
+        """
+        result = SolveResult(self.line, self.status)
+        for name in SolveResult.__slots__:
+            setattr(result, name, getattr(self, name))
+        return result
+
+    def move_string(self):
+        """ returns the moves of the solution as a string of the first
+            letters of their directions, such as 'urdl', or None
+        """
+        if self.moves == None:
+            return None
+        return ''.join([MOVE_NAMES[code][0] for code in self.moves])
+
+    def record(self):
+        """ returns a dictionary of the result that can be written as JSON
+        """
+        return {'board': self.digitstr, 'line': self.line, 'status': self.status,
+                'num_moves': self.num_moves, 'moves': self.move_string(),
+                'num_tested': self.num_tested, 'seconds': round(self.seconds, 6),
+                'duplicate': self.duplicate, 'cached': self.cached, 'error': self.error}
+
+    def text(self):
+        """ returns the line of the text report of process_file for the result
+        """
+        line = self.line
+        if self.duplicate:
+            if self.status == 'unsolvable':
+                return f'{line}: no solution (unsolvable, duplicate)'
+            elif self.status == 'invalid':
+                return f'{line}: invalid line, {self.error} (duplicate)'
+            elif self.status == 'no solution' or self.status == 'too far':
+                return f'{line}: no solution (duplicate)'
+            elif self.status != 'solved':
+                return f'{line}: search {self.status}, no solution (duplicate)'
+            elif self.cached:
+                return f'{line}: {self.num_moves} moves, from the solution cache (duplicate)'
+            return f'{line}: {self.num_moves} moves, {self.num_tested} states tested (duplicate)'
+
+        if self.status == 'unsolvable':
+            return f'{line}: no solution (unsolvable)'
+        elif self.status == 'invalid':
+            return f'{line}: invalid line, {self.error}'
+        elif self.status == 'too far':
+            return (f'{line}: no solution (Manhattan distance ' +
+                    f'{self.distance} is over the depth limit)')
+        elif self.status == 'no solution':
+            return 'no solution'
+        elif self.status != 'solved':
+            return f'{line}: search {self.status}, no solution'
+        elif self.cached:
+            return f'{line}: {self.num_moves} moves, from the solution cache'
+        return f'{line}: {self.num_moves} moves, {self.num_tested} states tested'
+
+class ResultTotals:
+    """ A class for objects that add up a stream of SolveResult objects in
+        constant memory, keeping counts and sums instead of the results.
+    """
+    def __init__(self):
+        """ a constructor for a ResultTotals object
+        """
+        self.lines = 0
+        # the lines solved by a search, which the averages are taken over
+        self.solved = 0
+        self.unsolvable = 0
+        self.duplicates = 0
+        self.stopped = 0
+        self.too_far = 0
+        self.invalid = 0
+        self.from_cache = 0
+        self.total_moves = 0
+        self.total_tested = 0
+        self.total_seconds = 0.0
+        self.max_moves = None
+        self.cache_hits = 0
+        self.cache_misses = 0
+
+    def add(self, result):
+        """ adds the input SolveResult object to the totals
+        """
+        self.lines += 1
+        if result.duplicate:
+            self.duplicates += 1
+        if result.status == 'unsolvable':
+            self.unsolvable += 1
+        elif result.status == 'invalid':
+            self.invalid += 1
+        elif result.status == 'solved':
+            if result.cached:
+                self.from_cache += 1
+            # a duplicate of a searched board counts as solved again, as
+            # process_file has always counted it
+            else:
+                self.solved += 1
+                self.total_moves += result.num_moves
+                self.total_tested += result.num_tested
+            if self.max_moves == None or result.num_moves > self.max_moves:
+                self.max_moves = result.num_moves
+        # a duplicate of a search that ran out of budget was not stopped
+        # again
+        elif result.status.startswith('budget exhausted') and not result.duplicate:
+            self.stopped += 1
+        elif result.status == 'too far' and not result.duplicate:
+            self.too_far += 1
+        if not result.duplicate:
+            self.total_seconds += result.seconds
+            if result.cache_counts != None:
+                self.cache_hits += result.cache_counts[0]
+                self.cache_misses += result.cache_counts[1]
+
+    def average_moves(self):
+        """ returns the average number of moves of the searched solutions,
+            or None if there are none
+        """
+        if self.solved == 0:
+            return None
+        return self.total_moves / self.solved
+
+    def average_tested(self):
+        """ returns the average number of states tested by the searches
+            that found a solution, or None if there are none
+        """
+        if self.solved == 0:
+            return None
+        return self.total_tested / self.solved
+
+    def summary(self, stored = None):
+        """ returns the list of lines of the summary of the text report
+            input stored: the number of new solutions added to the solution
+            cache, or None if the batch had no solution cache
+        """
+        lines = [f'solved {self.solved} puzzles']
+        # reports the lines that were answered without a search
+        if self.unsolvable > 0:
+            lines += [f'rejected {self.unsolvable} unsolvable puzzles']
+        if self.invalid > 0:
+            lines += [f'skipped {self.invalid} invalid lines']
+        if self.duplicates > 0:
+            lines += [f'reused {self.duplicates} duplicate results']
+        if self.stopped > 0:
+            lines += [f'stopped {self.stopped} searches that ran out of budget']
+        if self.too_far > 0:
+            lines += [f'ruled out {self.too_far} puzzles by their Manhattan distance']
+        if stored != None:
+            lines += [f'solution cache: {self.from_cache} puzzles answered without ' +
+                      f'a search, {stored} new solutions stored']
+        if self.cache_hits + self.cache_misses > 0:
+            lines += [f'heuristic cache: {self.cache_hits} hits, {self.cache_misses} misses, ' +
+                      f'{100 * self.cache_hits / (self.cache_hits + self.cache_misses):.1f}% hit rate']
+        if self.solved > 0:
+            lines += [f'averages: {self.average_moves()} moves, ' +
+                      f'{self.average_tested()} states tested']
+        return lines
+
+# the columns of the CSV files written by write_csv
+CSV_FIELDS = ['board', 'line', 'status', 'num_moves', 'moves', 'num_tested',
+              'seconds', 'duplicate', 'cached', 'error']
+
+def write_jsonl(results, f):
+    """ writes the record of each input result to a line of the input file
+        as JSON, as the results arrive, and returns a ResultTotals object of
+        them
+        inputs:
+          * results - an iterable of SolveResult objects, such as the
+            generator returned by solve_stream
+          * f - a file opened for writing text
+    """
+    totals = ResultTotals()
+    for result in results:
+        f.write(json.dumps(result.record()) + '\n')
+        totals.add(result)
+    return totals
+
+def write_csv(results, f):
+    """ writes the record of each input result to a row of the input file
+        as CSV with a header row, as the results arrive, and returns a
+        ResultTotals object of them
+        inputs:
+          * results - an iterable of SolveResult objects, such as the
+            generator returned by solve_stream
+          * f - a file opened for writing text with newline=''
+    """
+    totals = ResultTotals()
+    writer = csv.DictWriter(f, CSV_FIELDS)
+    writer.writeheader()
+    for result in results:
+        writer.writerow(result.record())
+        totals.add(result)
+    return totals
@@ -0,0 +1,228 @@
+import time
+
+class TimedHeuristic:
+    """ A class for heuristic functions that add the time spent in another
+        heuristic function to a SearchStats object.
+    """
+    def __init__(self, heuristic, stats):
+        """ a constructor for a TimedHeuristic object
+            inputs:
+              * heuristic - the heuristic function to time
+              * stats - the SearchStats object that collects the time
+        """
+        self.heuristic = heuristic
+        self.stats = stats
+        self.__name__ = heuristic.__name__
+        # keeps the batch form of the heuristic, timed the same way
+        if hasattr(heuristic, 'batch'):
+            self.batch = self.timed_batch
+
+    def __call__(self, state):
+        """ returns the value of the heuristic function on the input state
+            input state: a State object
+        """
+        start = time.perf_counter()
+        value = self.heuristic(state)
+        self.stats.heuristic_seconds += time.perf_counter() - start
+        self.stats.heuristic_calls += 1
+        return value
+
+    def timed_batch(self, states):
+        """ returns the list of values of the heuristic's batch function on
+            the input list of states
+            input states: a list of State objects
+        """
+        start = time.perf_counter()
+        values = self.heuristic.batch(states)
+        self.stats.heuristic_seconds += time.perf_counter() - start
+        self.stats.heuristic_calls += len(states)
+        return values
+
+class SearchStats:
+    """ A class for objects that collect what a searcher does during one
+        search. A searcher whose stats attribute is None skips every hook,
+        which costs one comparison per state tested.
+    """
+    def __init__(self, sample_every = 1000):
+        """ a constructor for a SearchStats object
+            input sample_every: the number of states expanded between two
+            samples of the nodes per second
+        """
+        self.sample_every = sample_every
+        self.algorithm = None
+        # the states returned by generate_successors, the states tested and
+        # expanded, the successors that should_add turned down (duplicates,
+        # cycles and states past the depth limit), and the states skipped
+        # because their board had already been tested
+        self.generated = 0
+        self.expanded = 0
+        self.pruned = 0
+        self.skipped = 0
+        self.peak_frontier = 0
+        self.heuristic_calls = 0
+        # the seconds spent in each part of the search
+        self.heuristic_seconds = 0.0
+        self.successor_seconds = 0.0
+        self.frontier_seconds = 0.0
+        self.start_time = None
+        self.end_time = None
+        # a list of [seconds since the start, nodes per second] samples
+        self.samples = []
+
+    def __repr__(self):
+        """ returns a string representation of the SearchStats object
+        """
+        return format_report(self.report())
+
+    def start(self, searcher):
+        """ starts the clock, and times the heuristic function of the input
+            searcher if it has one
+            input searcher: the Searcher object whose search is measured
+        """
+        self.algorithm = type(searcher).__name__
+        self.start_time = time.perf_counter()
+        self.sample_time = self.start_time
+        if hasattr(searcher, 'heuristic') and searcher.heuristic != None:
+            if not isinstance(searcher.heuristic, TimedHeuristic):
+                searcher.heuristic = TimedHeuristic(searcher.heuristic, self)
+        self.frontier_changed(searcher)
+
+    def finish(self):
+        """ stops the clock
+        """
+        self.end_time = time.perf_counter()
+
+    def not_collected(self, *names):
+        """ sets the input counts to None, for a searcher that does not call
+            the hooks that collect them, so its report does not show a 0
+            that was never measured
+            input names: names of counts such as 'generated'
+        """
+        for name in names:
+            setattr(self, name, None)
+
+    def frontier_changed(self, searcher):
+        """ updates the peak size of the frontier of the input searcher
+            input searcher: a Searcher object
+        """
+        if len(searcher.states) > self.peak_frontier:
+            self.peak_frontier = len(searcher.states)
+
+    def next_state(self, searcher):
+        """ returns searcher.next_state(), timing it as a frontier operation
+            input searcher: a Searcher object
+        """
+        start = time.perf_counter()
+        s = searcher.next_state()
+        self.frontier_seconds += time.perf_counter() - start
+        return s
+
+    def expand(self, searcher, state):
+        """ generates the successors of the input state and adds them to the
+            frontier of the input searcher, timing each part, and returns
+            what searcher.add_states returns
+            inputs:
+              * searcher - a Searcher object
+              * state - the State object to expand
+        """
+        start = time.perf_counter()
+        successors = state.generate_successors()
+        generated = time.perf_counter()
+        self.successor_seconds += generated - start
+
+        heuristic_seconds = self.heuristic_seconds
+        size = len(searcher.states)
+        result = searcher.add_states(successors)
+        # the time of add_states other than the heuristic is spent on
+        # should_add and the frontier
+        done = time.perf_counter()
+        self.frontier_seconds += (done - generated) - (self.heuristic_seconds - heuristic_seconds)
+
+        self.expanded += 1
+        self.generated += len(successors)
+        # a goal found by add_states ends the search before its remaining
+        # successors are looked at, so they are not counted as pruned
+        if result == None:
+            self.pruned += len(successors) - (len(searcher.states) - size)
+        self.frontier_changed(searcher)
+
+        if self.expanded % self.sample_every == 0:
+            self.samples += [[round(done - self.start_time, 4),
+                              round(self.sample_every / (done - self.sample_time))]]
+            self.sample_time = done
+        return result
+
+    def report(self):
+        """ returns a dictionary of the numbers collected so far, which can
+            be written as JSON
+        """
+        end = self.end_time
+        if end == None:
+            end = time.perf_counter()
+        total = 0.0
+        if self.start_time != None:
+            total = end - self.start_time
+        seconds = {'heuristic': self.heuristic_seconds,
+                   'successors': self.successor_seconds,
+                   'frontier': self.frontier_seconds,
+                   'other': max(0.0, total - self.heuristic_seconds -
+                                self.successor_seconds - self.frontier_seconds),
+                   'total': total}
+        return {'algorithm': self.algorithm, 'generated': self.generated,
+                'expanded': self.expanded, 'pruned': self.pruned,
+                'skipped': self.skipped, 'peak_frontier': self.peak_frontier,
+                'heuristic_calls': self.heuristic_calls, 'seconds': seconds,
+                'nodes_per_sec': self.expanded / total if total > 0 else None,
+                'samples': self.samples}
+
+def combine_reports(reports):
+    """ returns one report that adds up the counts and seconds of the input
+        reports, with the largest of their peak frontiers and no samples; a
+        count is None if none of the reports collected it
+        input reports: a list of dictionaries returned by SearchStats.report
+    """
+    combined = {'algorithm': None, 'searches': len(reports), 'generated': None,
+                'expanded': 0, 'pruned': None, 'skipped': None, 'peak_frontier': None,
+                'heuristic_calls': 0,
+                'seconds': {'heuristic': 0.0, 'successors': 0.0, 'frontier': 0.0,
+                            'other': 0.0, 'total': 0.0},
+                'nodes_per_sec': None, 'samples': []}
+    for report in reports:
+        combined['algorithm'] = report['algorithm']
+        for name in ['generated', 'expanded', 'pruned', 'skipped', 'heuristic_calls']:
+            if report[name] != None:
+                combined[name] = (combined[name] or 0) + report[name]
+        if report['peak_frontier'] != None:
+            combined['peak_frontier'] = max(combined['peak_frontier'] or 0,
+                                            report['peak_frontier'])
+        for part in combined['seconds']:
+            combined['seconds'][part] += report['seconds'][part]
+    if combined['seconds']['total'] > 0:
+        combined['nodes_per_sec'] = combined['expanded'] / combined['seconds']['total']
+    return combined
+
+def format_report(report):
+    """ returns a string of the input report as a small table
+        input report: a dictionary returned by SearchStats.report or
+        combine_reports
+    """
+    # shows '-' for the counts that were not collected
+    counts = {}
+    for name in ['generated', 'expanded', 'pruned', 'skipped', 'peak_frontier']:
+        counts[name] = '-' if report[name] == None else report[name]
+    s = f'search statistics ({report["algorithm"]})\n'
+    s += f'  states generated   {counts["generated"]:>12}\n'
+    s += f'  states expanded    {counts["expanded"]:>12}\n'
+    s += f'  pruned by should_add {counts["pruned"]:>10}\n'
+    s += f'  skipped as tested  {counts["skipped"]:>12}\n'
+    s += f'  peak frontier      {counts["peak_frontier"]:>12}\n'
+    s += f'  heuristic calls    {report["heuristic_calls"]:>12}\n'
+    seconds = report['seconds']
+    total = seconds['total']
+    for part in ['heuristic', 'successors', 'frontier', 'other']:
+        share = 100 * seconds[part] / total if total > 0 else 0
+        s += f'  {part + " seconds":<18} {seconds[part]:>12.4f} ({share:.1f}%)\n'
+    s += f'  total seconds      {total:>12.4f}\n'
+    if report['nodes_per_sec'] != None:
+        s += f'  nodes/sec          {report["nodes_per_sec"]:>12.0f}\n'
+    return s
@@ -1,5 +1,14 @@
 import random
+import heapq
+import math
+import itertools
+from collections import deque, OrderedDict
 from state import *
+from budget import *
+from batch_heuristics import *
+from pattern_db import get_database
+from oracle import get_oracle
+from sweep import sweep, moves_to_goal
 
 class Searcher:
     """ A class for objects that perform random state-space
@@ -10,16 +19,28 @@ class Searcher:
     ### Add your Searcher method definitions here. ###
     
     # function 1
-    def __init__(self, depth_limit):
+    def __init__(self, depth_limit, graph_search = False):
         """ the constructor method for object Searcher
             input depth_limit: an appropriate integer indicating the depth
             limit
+            input graph_search: True to prune every board that has already
+            been seen, instead of only cycles on the current path
         """
         # creates an attribute of states as an empty list
         self.states = []
         # creates an attribute of tested sates as 0
         self.num_tested = 0
         self.depth_limit = depth_limit
+        self.graph_search = graph_search
+        # in graph-search mode, the board keys of the tested states, and the
+        # board keys of the untested states mapped to their num_moves
+        self.closed = set()
+        self.open = {}
+        # a search_stats.SearchStats object that collects what the search
+        # does, or None to skip every instrumentation hook
+        self.stats = None
+        # a budget.Budget object that limits the search, or None for none
+        self.budget = None
 
 
     def __repr__(self):
@@ -45,6 +66,14 @@ class Searcher:
         # returns False if there is no depth limit, or it is pass the depth limit
         if self.depth_limit != -1 and state.num_moves > self.depth_limit:
             return False
+        # in graph-search mode, returns False if the board has been tested,
+        # or is already waiting to be tested with no more moves
+        elif self.graph_search:
+            key = state.board.key()
+            if key in self.closed:
+                return False
+            num_moves = self.open.get(key)
+            return num_moves == None or state.num_moves < num_moves
         # returns False if the state creates a repeating cycle 
         elif state.creates_cycle():
             return False
@@ -68,6 +97,9 @@ class Searcher:
         for state in new_states:
             # tests if the state should be added or not
             if self.should_add(state):
+                # remembers the board so later duplicates can be pruned
+                if self.graph_search:
+                    self.open[state.board.key()] = state.num_moves
                 # adds the state to self.states
                 self.add_state(state)
                 
@@ -83,30 +115,67 @@ class Searcher:
         
         return s
     
+    def close(self, state):
+        """ marks the board of the input state as tested in graph-search
+            mode, returning False if it had already been tested through a
+            different path
+            input state: a State object
+        """
+        key = state.board.key()
+        if key in self.closed:
+            return False
+        self.closed.add(key)
+        self.open.pop(key, None)
+        return True
+
     # function 6
     def find_solution(self, init_state):
         """ performs a full-random state-space search that stops when the
             goal state is reached, returning the goal state
             input init_state: a State object
         """
+        stats = self.stats
+        budget = self.budget
         # adds the ini_state input to the list self.states
-        self.states.append(init_state)
+        self.add_state(init_state)
+        if stats != None:
+            stats.start(self)
+        if budget != None:
+            budget.start()
         
         # loops through all the self.states until there are none left, or
         # the the goal_state is found
         while len(self.states) > 0:
             # finds a randonm state from self.states, tests it, then removes it
-            s = self.next_state()
+            if stats == None:
+                s = self.next_state()
+            else:
+                s = stats.next_state(self)
+            # in graph-search mode, skips boards that were already tested
+            # through a different path
+            if self.graph_search and not self.close(s):
+                if stats != None:
+                    stats.skipped += 1
+                continue
             # adds one to self.num_tested, keeping track of states tested
             self.num_tested += 1
             # stops if it has reached the goal
             if s.is_goal():
+                if stats != None:
+                    stats.finish()
                 return s
+            # stops before expanding the state if a limit has run out
+            if budget != None:
+                budget.check(self.num_tested, len(self.states))
             # adds the successors of the chosen state to self.states
-            else:
+            if stats == None:
                 self.add_states(s.generate_successors())
+            else:
+                stats.expand(self, s)
         
         # returns none if the Searcher could not find a solution
+        if stats != None:
+            stats.finish()
         return None
     
 ### Add your BFSeacher and DFSearcher class definitions below. ###
@@ -116,17 +185,90 @@ class BFSearcher(Searcher):
     """ A class for objects that perform a Breadth First state-space
         search on an Eight Puzzle.
     """
+    def __init__(self, depth_limit, graph_search = False):
+        """ the constructor method for object BFSearcher
+            input depth_limit: an appropriate integer indicating the depth
+            limit
+            input graph_search: True to prune every board that has already
+            been seen
+        """
+        super().__init__(depth_limit, graph_search)
+        # a deque pops the oldest state in O(1)
+        self.states = deque()
+
     def next_state(self):
         """ chooses the next state, which is the state that has been in the 
-            list the longest, to be tested, then removes it from the list and
-            returns it
+            deque the longest, to be tested, then removes it from the deque
+            and returns it
         """
-        # chooses the first state is self.states
-        s = self.states[0]
-        # removes that state
-        self.states.remove(s)
-        
-        return s
+        return self.states.popleft()
+
+    def add_states(self, new_states):
+        """ adds an input list new_states to self.states, testing each one as
+            it is generated, and returns the first goal state found or None
+            input new_state: a list of state objects (successors)
+        """
+        for state in new_states:
+            if self.should_add(state):
+                # every state in a layer is added before any state of the
+                # next layer is tested, so the first goal generated is as
+                # shallow as the first goal that would have been expanded
+                if state.is_goal():
+                    return state
+                if self.graph_search:
+                    self.open[state.board.key()] = state.num_moves
+                self.add_state(state)
+        return None
+
+    def find_solution(self, init_state):
+        """ performs a breadth-first state-space search that tests states
+            when they are generated, returning the goal state
+            input init_state: a State object
+        """
+        stats = self.stats
+        budget = self.budget
+        if stats != None:
+            stats.start(self)
+        if budget != None:
+            budget.start()
+        # the initial state is the only one that is not generated
+        if init_state.is_goal():
+            self.num_tested += 1
+            if stats != None:
+                stats.finish()
+            return init_state
+        self.add_state(init_state)
+        if stats != None:
+            stats.frontier_changed(self)
+
+        while len(self.states) > 0:
+            if stats == None:
+                s = self.next_state()
+            else:
+                s = stats.next_state(self)
+            if self.graph_search and not self.close(s):
+                if stats != None:
+                    stats.skipped += 1
+                continue
+            # counts the expanded states and, below, the goal, which matches
+            # the states an expansion-time test would count before the goal's
+            # layer plus the goal itself
+            self.num_tested += 1
+            if budget != None:
+                budget.check(self.num_tested, len(self.states))
+            if stats == None:
+                goal = self.add_states(s.generate_successors())
+            else:
+                goal = stats.expand(self, s)
+            if goal != None:
+                self.num_tested += 1
+                if stats != None:
+                    stats.finish()
+                return goal
+
+        if stats != None:
+            stats.finish()
+        return None
 
 # class 2
 class DFSearcher(Searcher):
@@ -154,28 +296,192 @@ def h1(state):
     """ a heuristic function that returns the number of misplaced tiles"""
     return state.board.num_misplaced()
 
+def h1_batch(states):
+    """ returns a list of the values of h1 on the input list of State
+        objects, computed from their tiles with NumPy when it is available
+    """
+    if len(states) == 0:
+        return []
+    return misplaced_batch(tile_array([state.board for state in states]))
+
 def h2(state):
     """ a heuristic function that returns a number of the sum of 
         all the distances each tile has to travel to get to the goal
         state"""
     return state.board.manhattangeo()
 
+def h2_batch(states):
+    """ returns a list of the values of h2 on the input list of State
+        objects, computed from their tiles with NumPy when it is available
+    """
+    if len(states) == 0:
+        return []
+    return manhattan_batch(tile_array([state.board for state in states]))
+
+# a heuristic function with a batch attribute can also be called on a list
+# of states at once (see GreedySearcher.batch)
+h1.batch = h1_batch
+h2.batch = h2_batch
+
+def h3(state):
+    """ a heuristic function that returns the Manhattan distance plus 2
+        moves for each tile that must leave its goal row or column to let
+        another tile of that line pass"""
+    return state.board.manhattangeo() + state.board.linear_conflicts()
+
+def hpdb(state):
+    """ a heuristic function that returns the sum of the distances stored in
+        the additive pattern databases of pattern_db.DEFAULT_PATTERNS for
+        the size of the board"""
+    return get_database(size=state.board.size).distance(state.board)
+
+def hstar(state):
+    """ a heuristic function that returns the exact number of moves left,
+        looked up in the distance oracle, or infinity if there is no
+        solution"""
+    d = get_oracle().distance(state.board)
+    if d == None:
+        return math.inf
+    return d
+
+class MaxHeuristic:
+    """ A class for heuristic functions that return the largest value of
+        several other heuristic functions. Unlike a nested function, its
+        objects can be sent to the worker processes of process_file.
+    """
+    def __init__(self, heuristics):
+        """ a constructor for a MaxHeuristic object
+            input heuristics: a list of heuristic functions
+        """
+        self.heuristics = list(heuristics)
+        self.__name__ = 'hmax(' + ', '.join([h.__name__ for h in self.heuristics]) + ')'
+
+    def __repr__(self):
+        """ returns a string representation of the MaxHeuristic object
+        """
+        return self.__name__
+
+    def __call__(self, state):
+        """ returns the largest value of the heuristic functions on the input
+            state, calling each of them once
+            input state: a State object
+        """
+        best = 0
+        for heuristic in self.heuristics:
+            value = heuristic(state)
+            if value > best:
+                best = value
+        return best
+
+def hmax(*heuristics):
+    """ returns a heuristic function that returns the largest value of the
+        input heuristic functions, which is admissible if each of them is
+        inputs: heuristic functions such as h2, h3 and hpdb
+    """
+    return MaxHeuristic(heuristics)
+
+class HeuristicCache:
+    """ A class for heuristic functions that remember the values of another
+        heuristic function for the most recently used boards. One object
+        can be shared by many searchers, so boards that come up again in
+        sibling branches, IDA* iterations or other puzzles are looked up
+        instead of computed. It pays off for the costlier heuristics such
+        as h3, hpdb and hmax, not for h1 and h2, which boards keep up to
+        date as they move.
+    """
+    def __init__(self, heuristic, max_size = 100000):
+        """ a constructor for a HeuristicCache object
+            inputs:
+              * heuristic - the heuristic function whose values are cached
+              * max_size - the most boards that are remembered; the least
+                recently used board is forgotten to make room for a new one
+        """
+        self.heuristic = heuristic
+        self.max_size = max_size
+        self.__name__ = heuristic.__name__
+        # maps the key of each board to its value, from the least to the
+        # most recently used
+        self.values = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    def __repr__(self):
+        """ returns a string representation of the HeuristicCache object
+        """
+        s = 'HeuristicCache(' + self.__name__ + '): '
+        s += str(len(self.values)) + ' of ' + str(self.max_size) + ' boards, '
+        s += str(self.hits) + ' hits, ' + str(self.misses) + ' misses'
+        return s
+
+    def __call__(self, state):
+        """ returns the value of the heuristic function on the input state,
+            computing it only if the board is not remembered
+            input state: a State object
+        """
+        key = state.board.key()
+        value = self.values.get(key)
+        if value != None:
+            self.hits += 1
+            self.values.move_to_end(key)
+            return value
+
+        self.misses += 1
+        value = self.heuristic(state)
+        self.values[key] = value
+        if len(self.values) > self.max_size:
+            self.values.popitem(last=False)
+        return value
+
+    def clear(self):
+        """ forgets every board and resets the hit and miss counts
+        """
+        self.values.clear()
+        self.hits = 0
+        self.misses = 0
+
+# the HeuristicCache objects created so far in this process, keyed by the
+# name of their heuristic and their size
+heuristic_caches = {}
+
+def get_heuristic_cache(heuristic, max_size = 100000):
+    """ returns the HeuristicCache object of this process for the input
+        heuristic function and size, creating it only the first time it is
+        asked for. The heuristic's name is the key, so the copies of a
+        heuristic sent to a worker process share one cache.
+        inputs:
+          * heuristic - a heuristic function
+          * max_size - the most boards that the cache remembers
+    """
+    key = (heuristic.__name__, max_size)
+    if key not in heuristic_caches:
+        heuristic_caches[key] = HeuristicCache(heuristic, max_size)
+    return heuristic_caches[key]
+
 # class 3
 class GreedySearcher(Searcher):
     """ A class for objects that perform an informed greedy state-space
         search on an Eight Puzzle.
     """
     
-    def __init__(self, depth_limit, heuristic):
+    def __init__(self, depth_limit, heuristic, graph_search = False):
         """ constructor for a GreedySearcher object
             inputs:
              * depth_limit - the depth limit of the searcher
              * heuristic - a reference to the function that should be used 
              when computing the priority of a state
+             * graph_search - True to prune boards that were already seen
         """
         # calls the Superclass Searcher to inherit the depth_limit attribute
-        super().__init__(depth_limit)
+        super().__init__(depth_limit, graph_search)
         self.heuristic = heuristic
+        # counts the states that have been added, so that ties in priority
+        # are broken by insertion order instead of by comparing states
+        self.counter = itertools.count()
+        # True to evaluate the heuristic once per expansion on all the new
+        # successors, if it has a batch attribute; the successors of one
+        # state are too few for NumPy to pay off (see benchmark.py batch),
+        # so this is off by default
+        self.batch = False
 
     def __repr__(self):
         """ returns a string representation of the GreedySearcher object
@@ -188,59 +494,54 @@ class GreedySearcher(Searcher):
         s += 'heuristic ' + self.heuristic.__name__
         return s
 
-    def priority(self, state):
+    def priority(self, state, h = None):
         """ returns an integer score of the priority the state has respectively
             to other states
             input state: a State object
+            input h: the heuristic value of the state, if it is known
         """
         # calls the heuristic function to get a number of misplaced tiles
-        h = self.heuristic(state)
+        if h == None:
+            h = self.heuristic(state)
         # calculates the priority to allow the max() function later on
         priority = -1 * h
         
         return priority 
     
-    def add_state(self, state):
-        """ adds the input state and its priority to the list of lists self.states
+    def add_state(self, state, h = None):
+        """ pushes the input state onto the binary heap self.states
+            input h: the heuristic value of the state, if it is known
         """
-        # appends state and its priority to the self.states list of lists
-        self.states.append([self.priority(state), state])
-        
-    def next_state(self):
-        """ chooses the next state, which is the state that has the mas priority,
-            to be tested, then removes it from the list and returns it
+        # heapq pops the smallest entry, so both the priority and the
+        # insertion count are negated: the highest priority comes first, and
+        # among equal priorities the most recently added state comes first,
+        # which is the order that max() on [priority, state] pairs used
+        heapq.heappush(self.states, (-self.priority(state, h), -next(self.counter), state))
+
+    def add_states(self, new_states):
+        """ adds an input list new_states to self.states, evaluating the
+            heuristic on all of them in one call in batch mode
+            input new_state: a list of state objects (successors)
         """
-        # chooses the max priority state is self.states
-        s = max(self.states)
-        # removes that state
-        self.states.remove(s)
+        if not self.batch or not hasattr(self.heuristic, 'batch'):
+            return super().add_states(new_states)
+
+        accepted = []
+        for state in new_states:
+            if self.should_add(state):
+                if self.graph_search:
+                    self.open[state.board.key()] = state.num_moves
+                accepted += [state]
+        # pushes the states in the same order as one at a time
+        for state, h in zip(accepted, self.heuristic.batch(accepted)):
+            self.add_state(state, h)
         
-        return s[1]
-    
-    def find_solution(self, init_state):
-        """ performs a full-random state-space search that stops when the
-            goal state is reached, returning the goal state
-            input init_state: a State object
+    def next_state(self):
+        """ chooses the next state, which is the state that has the max priority,
+            to be tested, then removes it from the heap and returns it
         """
-        # adds the init_state and the priority input to the list self.states
-        self.states.append([self.priority(init_state), init_state])
-        
-        # loops through all the self.states until there are none left, or
-        # the the goal_state is found
-        while len(self.states) > 0:
-            # finds a randonm state from self.states, tests it, then removes it
-            s = self.next_state()
-            # adds one to self.num_tested, keeping track of states tested
-            self.num_tested += 1
-            # stops if it has reached the goal
-            if s.is_goal():
-                return s
-            # adds the successors of the chosen state to self.states
-            else:
-                self.add_states(s.generate_successors())
-        
-        # returns none if the Searcher could not find a solution
-        return None
+        # pops the max priority state in O(log n)
+        return heapq.heappop(self.states)[2]
 
 ### Add your AStarSeacher class definition below. ###
 
@@ -248,20 +549,556 @@ class AStarSearcher(GreedySearcher):
     """ A class for objects that perform an informed A* state-space
         search on an Eight Puzzle.
     """
+    # the weight of the heuristic in the priority; over 1, states that look
+    # close to the goal are tested sooner, and a solution may be up to this
+    # many times longer than the shortest
+    weight = 1
     
-    def priority(self, state):
+    def priority(self, state, h = None):
         """ returns an integer score of the priority the state has respectively
             to other states
             input state: a State object
+            input h: the heuristic value of the state, if it is known
         """
         # calls the heurstic function to get a number of misplaced tiles
-        heuristic = self.heuristic(state)
+        heuristic = h
+        if heuristic == None:
+            heuristic = self.heuristic(state)
         cost = state.num_moves
         # calculates the priority to allow the max() function later on
-        priority = -1 * (heuristic + cost)
+        priority = -1 * (self.weight * heuristic + cost)
         
         return priority
 
+class AnytimeSearcher(AStarSearcher):
+    """ A class for objects that perform an anytime weighted A* search: a
+        first search with a large weight on the heuristic finds a solution
+        quickly, and each later search with a smaller weight continues from
+        the states the one before it reached, finding shorter solutions
+        until the weight is 1 or the solution is proven optimal.
+    """
+    def __init__(self, depth_limit, heuristic, weights = None,
+                 deadline = None, callback = None):
+        """ constructor for an AnytimeSearcher object
+            inputs:
+             * depth_limit - the depth limit of the searcher
+             * heuristic - a reference to the function that should be used
+             when computing the priority of a state
+             * weights - the decreasing list of weights of the searches,
+             ending with 1, by default [5, 3, 2, 1.5, 1.25, 1]
+             * deadline - an optional number of seconds after which the
+             best solution found so far is returned
+             * callback - an optional function that is called with the
+             goal state and the weight each time a shorter solution is found
+        """
+        super().__init__(depth_limit, heuristic)
+        if weights == None:
+            weights = [5, 3, 2, 1.5, 1.25, 1]
+        self.weights = weights
+        self.deadline = deadline
+        self.callback = callback
+        # a list of [weight, num_moves, states tested] triples, one per
+        # shorter solution found, and whether or not the last one is proven
+        # to be optimal
+        self.solutions = []
+        self.optimal = False
+
+    def __repr__(self):
+        """ returns a string representation of the AnytimeSearcher object
+            referred to by self.
+        """
+        s = type(self).__name__ + ': '
+        s += str(len(self.solutions)) + ' solutions, '
+        s += str(self.num_tested) + ' tested, '
+        s += 'heuristic ' + self.heuristic.__name__
+        return s
+
+    def improve(self, best, closed, inconsistent, budget):
+        """ tests the states of the frontier in order of num_moves plus
+            weight times heuristic until none of them can lead to a shorter
+            solution than best under this weight, and returns the goal state
+            of the shortest solution found so far, or None
+            inputs:
+             * best - the goal state of the shortest solution so far, or None
+             * closed - the set of board keys tested with this weight
+             * inconsistent - a dictionary that maps the board keys of
+               tested boards that were later reached in fewer moves to
+               their new State objects, to be tested with the next weight
+             * budget - the Budget object of the search, or None
+        """
+        while len(self.states) > 0:
+            # the least num_moves + weight * heuristic in the frontier
+            if best != None and best.num_moves <= self.states[0][0]:
+                break
+            s = heapq.heappop(self.states)[2]
+            key = s.board.key()
+            # skips a state whose board was reached in fewer moves since
+            if s.num_moves != self.moves[key] or key in closed:
+                continue
+            closed.add(key)
+            self.num_tested += 1
+            if budget != None:
+                budget.check(self.num_tested, len(self.states))
+
+            for succ in s.generate_successors():
+                if self.depth_limit != -1 and succ.num_moves > self.depth_limit:
+                    continue
+                key = succ.board.key()
+                old = self.moves.get(key)
+                if old != None and old <= succ.num_moves:
+                    continue
+                self.moves[key] = succ.num_moves
+                if succ.is_goal():
+                    best = succ
+                    continue
+                if key not in self.h_values:
+                    self.h_values[key] = self.heuristic(succ)
+                if key in closed:
+                    inconsistent[key] = succ
+                else:
+                    self.add_state(succ, self.h_values[key])
+        return best
+
+    def find_solution(self, init_state):
+        """ returns the goal state of the shortest solution found before the
+            weights run out, the solution is proven optimal or the deadline
+            passes, or None if there is no solution within the depth limit
+            input init_state: a State object
+        """
+        # the deadline is a time limit on a copy of the budget, which only
+        # stops the search early if no solution has been found
+        budget = self.budget
+        if self.deadline != None:
+            budget = Budget().merged(self.budget)
+            if budget.time_limit == None or self.deadline < budget.time_limit:
+                budget.time_limit = self.deadline
+        stats = self.stats
+        if stats != None:
+            stats.start(self)
+            # these counts are only collected by Searcher.find_solution's hooks
+            stats.not_collected('generated', 'pruned', 'skipped', 'peak_frontier')
+        if budget != None:
+            budget.start()
+
+        # the initial state is counted when improve expands it
+        if init_state.is_goal():
+            self.num_tested += 1
+            self.optimal = True
+            if stats != None:
+                stats.expanded = self.num_tested
+                stats.finish()
+            return init_state
+        key = init_state.board.key()
+        # the fewest moves found to each board, and its heuristic value
+        self.moves = {key: 0}
+        self.h_values = {key: self.heuristic(init_state)}
+        # the states to test with the next weight, by board key
+        pending = {key: init_state}
+        best = None
+
+        for weight in self.weights:
+            self.weight = weight
+            self.states = []
+            for key, state in pending.items():
+                self.add_state(state, self.h_values[key])
+            inconsistent = {}
+            try:
+                found = self.improve(best, set(), inconsistent, budget)
+            except BudgetExhausted:
+                if best == None:
+                    raise
+                break
+            if found != best:
+                best = found
+                self.solutions += [[weight, best.num_moves, self.num_tested]]
+                if self.callback != None:
+                    self.callback(best, weight)
+
+            # the states left to test, at their fewest moves
+            pending = inconsistent
+            for entry in self.states:
+                state = entry[2]
+                key = state.board.key()
+                if state.num_moves == self.moves[key] and key not in pending:
+                    pending[key] = state
+            # no solution can be shorter than the least num_moves plus
+            # heuristic of a state left to test
+            lower = math.inf
+            for key, state in pending.items():
+                lower = min(lower, state.num_moves + self.h_values[key])
+            if best != None and best.num_moves <= lower:
+                self.optimal = True
+                break
+            if best == None and lower == math.inf:
+                break
+
+        if stats != None:
+            stats.expanded = self.num_tested
+            stats.finish()
+        return best
+
+class OracleSearcher(Searcher):
+    """ A class for objects that solve an Eight Puzzle by looking up the
+        exact distance of each successor in the distance oracle and
+        moving to one that is one move closer to the goal.
+    """
+    def find_solution(self, init_state):
+        """ returns an optimal goal state reached from init_state, or None if
+            there is no solution within the depth limit
+            input init_state: a State object
+        """
+        oracle = get_oracle()
+        d = oracle.distance(init_state.board)
+        self.num_tested += 1
+        if d == None or (self.depth_limit != -1 and d > self.depth_limit):
+            return None
+
+        if self.budget != None:
+            self.budget.start()
+        s = init_state
+        while d > 0:
+            if self.budget != None:
+                self.budget.check(self.num_tested, 0)
+            # some successor is always exactly one move closer, and only
+            # the states on the way are counted as tested
+            for succ in s.generate_successors():
+                if oracle.distance(succ.board) == d - 1:
+                    s = succ
+                    d -= 1
+                    self.num_tested += 1
+                    break
+        return s
+
+class BidirectionalSearcher(Searcher):
+    """ A class for objects that perform a breadth-first state-space search
+        forward from the initial state and backward from the goal state at
+        the same time, stopping where the two searches meet.
+    """
+    def expand(self, layer, seen, other):
+        """ tests every state of the input layer, adding its new successors
+            to seen, and returns a tuple of the next layer and a state that
+            is also in other, or None
+            inputs:
+             * layer - a list of State objects that all have the same
+               num_moves
+             * seen - a dictionary that maps the board key of every state
+               found by this side of the search to its State object
+             * other - the dictionary of the other side of the search
+        """
+        next_layer = []
+        for s in layer:
+            self.num_tested += 1
+            # the frontier of both sides is every board they have found
+            if self.budget != None:
+                self.budget.check(self.num_tested, len(seen) + len(other))
+            for succ in s.generate_successors():
+                key = succ.board.key()
+                if key in seen:
+                    continue
+                seen[key] = succ
+                # no board is within the depth of both layers, so the
+                # first meeting found is on a shortest path
+                if key in other:
+                    return next_layer, succ
+                next_layer += [succ]
+        return next_layer, None
+
+    def find_solution(self, init_state):
+        """ performs a bidirectional breadth-first search, returning an
+            optimal goal state whose moves can be printed, or None
+            input init_state: a State object
+        """
+        # the initial state is counted when it is expanded
+        if init_state.is_goal():
+            self.num_tested += 1
+            return init_state
+        goal_state = State(init_state.board.goal(), None, 'init')
+        if self.budget != None:
+            self.budget.start()
+
+        forward = {init_state.board.key(): init_state}
+        backward = {goal_state.board.key(): goal_state}
+        forward_layer = [init_state]
+        backward_layer = [goal_state]
+        depth = 0
+        meet = None
+        while meet == None and len(forward_layer) > 0 and len(backward_layer) > 0:
+            # stops when every path within the depth limit has been tried
+            if self.depth_limit != -1 and depth >= self.depth_limit:
+                return None
+            depth += 1
+            # grows the side with the smaller layer
+            if len(forward_layer) <= len(backward_layer):
+                forward_layer, meet = self.expand(forward_layer, forward, backward)
+            else:
+                backward_layer, meet = self.expand(backward_layer, backward, forward)
+
+        if meet == None:
+            return None
+
+        # the backward states record the moves made from the goal, so the
+        # way from the meeting board to the goal undoes them in turn
+        key = meet.board.key()
+        moves = []
+        s = backward[key]
+        while s.predecessor != None:
+            moves += [INVERSE_CODES[s.move]]
+            s = s.predecessor
+        return forward[key].apply_moves(moves)
+
+class SweepSearcher(Searcher):
+    """ A class for objects that search breadth-first backward from the goal
+        state until they reach the initial state, keeping one move code per
+        board instead of a State object. sweep.solve_all does the same for
+        many boards at once.
+    """
+    def find_solution(self, init_state):
+        """ returns an optimal goal state reached from init_state, or None if
+            there is no solution within the depth limit
+            input init_state: a State object
+        """
+        board = init_state.board
+        # the sweep would test every board it can reach before giving up
+        if not board.is_solvable():
+            self.num_tested += 1
+            return None
+
+        parents, found, exhausted = sweep([board], self.depth_limit, self.budget)
+        if exhausted != None:
+            self.num_tested += exhausted.num_tested
+            raise exhausted
+        packed = board.tables.pack(board.tile_list())
+        if packed not in found:
+            self.num_tested += len(parents)
+            return None
+        self.num_tested += found[packed]
+        return init_state.apply_moves(moves_to_goal(parents, board))
+
+class IDAStarSearcher(Searcher):
+    """ A class for objects that perform an iterative-deepening A*
+        state-space search on an Eight Puzzle. Each iteration is a
+        depth-first search that cuts off states whose num_moves plus
+        heuristic is over a threshold, so memory only grows with the depth.
+    """
+
+    def __init__(self, depth_limit, heuristic):
+        """ constructor for an IDAStarSearcher object
+            inputs:
+             * depth_limit - the depth limit of the searcher
+             * heuristic - a reference to the function that should be used 
+             when computing the cost estimate of a state
+        """
+        super().__init__(depth_limit)
+        self.heuristic = heuristic
+        # a list of [threshold, states tested] pairs, one per iteration
+        self.iterations = []
+
+    def __repr__(self):
+        """ returns a string representation of the IDAStarSearcher object
+            referred to by self.
+        """
+        s = type(self).__name__ + ': '
+        s += str(len(self.iterations)) + ' iterations, '
+        s += str(self.num_tested) + ' tested, '
+        s += 'heuristic ' + self.heuristic.__name__
+        return s
+
+    def search(self, num_moves, threshold, last_move):
+        """ tests the board of self.probe and the boards below it, moving
+            the blank forward and back in place, and returns True if a goal
+            was found or else the smallest cost estimate that was cut off
+            inputs:
+             * num_moves - the number of moves made to reach the board
+             * threshold - the largest cost estimate to search
+             * last_move - the code of the move that reached the board, or
+               None
+        """
+        board = self.probe.board
+        cost = num_moves + self.heuristic(self.probe)
+        # cuts off the board, reporting its cost for the next threshold
+        if cost > threshold:
+            return cost
+        if self.depth_limit != -1 and num_moves > self.depth_limit:
+            return math.inf
+
+        self.nodes += 1
+        self.num_tested += 1
+        if board.is_goal():
+            return True
+        # the frontier of a depth-first search is its path
+        if self.budget != None:
+            self.budget.check(self.num_tested, len(self.path))
+
+        minimum = math.inf
+        for m in range(len(MOVES)):
+            # skips the move that would undo the last one
+            if last_move != None and m == INVERSE_CODES[last_move]:
+                continue
+            if board.move_blank(m):
+                self.path.append(m)
+                t = self.search(num_moves + 1, threshold, m)
+                if t is True:
+                    return True
+                # undoes the move before trying the next one
+                board.move_blank(INVERSE_CODES[m])
+                self.path.pop()
+                if t < minimum:
+                    minimum = t
+
+        return minimum
+
+    def find_solution(self, init_state):
+        """ performs iterative-deepening A* search from init_state, returning
+            the goal state, or None if there is no solution
+            input init_state: a State object
+        """
+        # the heuristic is called on a single State whose board is
+        # changed in place, so no State is created while searching
+        self.probe = State(init_state.board.copy(), None, 'init')
+        self.path = []
+        # only the heuristic is timed, since a hook in every call of search
+        # would cost more than the rest of it
+        stats = self.stats
+        if stats != None:
+            stats.start(self)
+            # these counts are only collected by Searcher.find_solution's hooks
+            stats.not_collected('generated', 'pruned', 'skipped', 'peak_frontier')
+        if self.budget != None:
+            self.budget.start()
+        threshold = self.heuristic(self.probe)
+        # an infinite estimate means the goal cannot be reached
+        if threshold == math.inf:
+            t = math.inf
+
+        while threshold != math.inf:
+            self.nodes = 0
+            t = self.search(0, threshold, None)
+            self.iterations += [[threshold, self.nodes]]
+            # stops if a goal was found; if nothing was cut off, there is
+            # no solution
+            if t is True or t == math.inf:
+                break
+            threshold = t
+
+        if stats != None:
+            stats.expanded = self.num_tested
+            stats.finish()
+        if t is True:
+            # builds a State chain so the moves can be printed
+            return init_state.apply_moves(self.path)
+        return None
+
+class IDDFSearcher(Searcher):
+    """ A class for objects that perform an iterative-deepening depth-first
+        state-space search on an Eight Puzzle. Each iteration is a
+        depth-first search one move deeper than the one before, so the first
+        solution found is a shortest one, and memory only grows with the
+        depth.
+    """
+    def __init__(self, depth_limit):
+        """ constructor for an IDDFSearcher object
+            input depth_limit: the deepest iteration to search, or -1 for
+            no limit
+        """
+        super().__init__(depth_limit)
+        # a list of [depth, states tested] pairs, one per iteration
+        self.iterations = []
+
+    def __repr__(self):
+        """ returns a string representation of the IDDFSearcher object
+            referred to by self.
+        """
+        s = type(self).__name__ + ': '
+        s += str(len(self.iterations)) + ' iterations, '
+        s += str(self.num_tested) + ' tested'
+        return s
+
+    def search(self, num_moves, limit, last_move):
+        """ tests self.board and the boards below it, moving the blank
+            forward and back in place, and returns True if a goal was found
+            inputs:
+             * num_moves - the number of moves made to reach the board
+             * limit - the depth of this iteration
+             * last_move - the code of the move that reached the board, or
+               None
+        """
+        board = self.board
+        goal = board.is_goal()
+        # cuts off the board, so the next iteration has to go deeper; it is
+        # not expanded, so as in BFSearcher only the expanded states and the
+        # goal are counted
+        if num_moves == limit and not goal:
+            self.cut_off = True
+            return False
+        self.nodes += 1
+        self.num_tested += 1
+        if goal:
+            return True
+        # the frontier of a depth-first search is its path
+        if self.budget != None:
+            self.budget.check(self.num_tested, len(self.path))
+
+        for m in range(len(MOVES)):
+            # skips the move that would undo the last one
+            if last_move != None and m == INVERSE_CODES[last_move]:
+                continue
+            if board.move_blank(m):
+                key = board.key()
+                # skips a board that is already on the path, which would
+                # make a cycle
+                if key not in self.on_path:
+                    self.on_path.add(key)
+                    self.path.append(m)
+                    if self.search(num_moves + 1, limit, m):
+                        return True
+                    self.path.pop()
+                    self.on_path.remove(key)
+                # undoes the move before trying the next one
+                board.move_blank(INVERSE_CODES[m])
+
+        return False
+
+    def find_solution(self, init_state):
+        """ performs iterative-deepening depth-first search from init_state,
+            returning the goal state of a shortest solution, or None if
+            there is no solution within the depth limit
+            input init_state: a State object
+        """
+        # the board is changed in place, so no State is created while
+        # searching, and the keys of the boards on the path are kept in a
+        # set, so a cycle is found without walking the predecessors
+        self.board = init_state.board.copy()
+        self.path = []
+        self.on_path = {self.board.key()}
+        stats = self.stats
+        if stats != None:
+            stats.start(self)
+            # these counts are only collected by Searcher.find_solution's hooks
+            stats.not_collected('generated', 'pruned', 'skipped', 'peak_frontier')
+        if self.budget != None:
+            self.budget.start()
+
+        found = False
+        limit = 0
+        while self.depth_limit == -1 or limit <= self.depth_limit:
+            self.nodes = 0
+            self.cut_off = False
+            found = self.search(0, limit, None)
+            self.iterations += [[limit, self.nodes]]
+            # stops if a goal was found; if no path was cut off, going
+            # deeper finds nothing new
+            if found or not self.cut_off:
+                break
+            limit += 1
+
+        if stats != None:
+            stats.expanded = self.num_tested
+            stats.finish()
+        if found:
+            # builds a State chain so the moves can be printed
+            return init_state.apply_moves(self.path)
+        return None
+
 
 if __name__ == "__main__":
     
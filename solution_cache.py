@@ -0,0 +1,155 @@
+import os
+import sqlite3
+import time
+from tables import *
+
+# the default file of the solution cache, next to the precomputed tables
+SOLUTION_FILE = table_path('solutions.sqlite')
+
+# the default number of solutions kept before the least recently used
+# ones are evicted
+MAX_SOLUTIONS = 1000000
+
+# the number of digitstrs looked up by one query, well under the limit
+# of SQLite on the parameters of a statement
+LOOKUP_CHUNK = 500
+
+def pack_moves(moves):
+    """ returns a bytes object that holds the input move codes in 2 bits
+        each, four to a byte
+        input moves: a list of move codes from 0 to 3
+    """
+    data = bytearray((len(moves) + 3) // 4)
+    for i in range(len(moves)):
+        data[i // 4] |= moves[i] << (2 * (i % 4))
+    return bytes(data)
+
+def unpack_moves(data, num_moves):
+    """ returns the list of move codes held by the input bytes object
+        inputs:
+          * data - a bytes object returned by pack_moves
+          * num_moves - the number of moves it holds
+    """
+    return [(data[i // 4] >> (2 * (i % 4))) & 3 for i in range(num_moves)]
+
+def heuristic_name(heuristic):
+    """ returns the name that the input heuristic function is stored under,
+        or '' for None
+    """
+    if heuristic == None:
+        return ''
+    return heuristic.__name__
+
+class SolutionCache:
+    """ A class for objects that keep the solutions found by searches in an
+        SQLite file, so that later runs can answer the same boards without
+        searching. Solutions are keyed by the digit string of the board,
+        the algorithm and the name of the heuristic, and the least recently
+        used ones are evicted when there are more than max_solutions.
+    """
+    def __init__(self, filename = None, max_solutions = MAX_SOLUTIONS):
+        """ a constructor for a SolutionCache object, which creates the file
+            if it is missing
+            inputs:
+              * filename - the SQLite file, or None for SOLUTION_FILE
+              * max_solutions - the most solutions the file may keep
+        """
+        if filename == None:
+            os.makedirs(TABLE_DIR, exist_ok=True)
+            filename = SOLUTION_FILE
+        self.filename = filename
+        self.max_solutions = max_solutions
+        # the lookups of this object that found a solution, and that did not
+        self.hits = 0
+        self.misses = 0
+        self.stored = 0
+        self.connection = sqlite3.connect(filename)
+        self.connection.execute('CREATE TABLE IF NOT EXISTS solutions ('
+                                'digitstr TEXT, algorithm TEXT, heuristic TEXT, '
+                                'num_moves INTEGER, moves BLOB, last_used REAL, '
+                                'PRIMARY KEY (digitstr, algorithm, heuristic))')
+        self.connection.execute('CREATE INDEX IF NOT EXISTS solutions_last_used '
+                                'ON solutions (last_used)')
+        self.connection.commit()
+
+    def __repr__(self):
+        """ returns a string representation of the SolutionCache object
+        """
+        return (f'SolutionCache: {len(self)} of {self.max_solutions} solutions, ' +
+                f'{self.hits} hits, {self.misses} misses, {self.stored} stored')
+
+    def __len__(self):
+        """ returns the number of solutions in the file
+        """
+        return self.connection.execute('SELECT COUNT(*) FROM solutions').fetchone()[0]
+
+    def lookup(self, digitstrs, algorithm, heuristic = None, depth_limit = -1):
+        """ returns a dictionary that maps each input digitstr with a stored
+            solution to its list of move codes
+            inputs:
+              * digitstrs - a list of digit strings as returned by
+                digit_string, so that each board has one key
+              * algorithm - the name of the algorithm that found the solutions
+              * heuristic - the heuristic function it used, or None
+              * depth_limit - the most moves a solution may take, or -1
+        """
+        digitstrs = list(dict.fromkeys(digitstrs))
+        name = heuristic_name(heuristic)
+        solutions = {}
+        for i in range(0, len(digitstrs), LOOKUP_CHUNK):
+            chunk = digitstrs[i:i + LOOKUP_CHUNK]
+            marks = ', '.join(['?'] * len(chunk))
+            rows = self.connection.execute(
+                'SELECT digitstr, num_moves, moves FROM solutions ' +
+                f'WHERE algorithm = ? AND heuristic = ? AND digitstr IN ({marks})',
+                [algorithm, name] + chunk)
+            for digitstr, num_moves, moves in rows:
+                if depth_limit == -1 or num_moves <= depth_limit:
+                    solutions[digitstr] = unpack_moves(moves, num_moves)
+
+        # marks the solutions that were found as just used
+        now = time.time()
+        self.connection.executemany(
+            'UPDATE solutions SET last_used = ? ' +
+            'WHERE digitstr = ? AND algorithm = ? AND heuristic = ?',
+            [(now, digitstr, algorithm, name) for digitstr in solutions])
+        self.connection.commit()
+        self.hits += len(solutions)
+        self.misses += len(digitstrs) - len(solutions)
+        return solutions
+
+    def store(self, solutions, algorithm, heuristic = None):
+        """ adds the input solutions to the file, then evicts the least
+            recently used solutions over max_solutions
+            inputs:
+              * solutions - a dictionary that maps digit strings as returned
+                by digit_string to lists of move codes
+              * algorithm - the name of the algorithm that found them
+              * heuristic - the heuristic function it used, or None
+        """
+        if len(solutions) == 0:
+            return
+        name = heuristic_name(heuristic)
+        now = time.time()
+        self.connection.executemany(
+            'INSERT OR REPLACE INTO solutions VALUES (?, ?, ?, ?, ?, ?)',
+            [(digitstr, algorithm, name, len(moves), pack_moves(moves), now)
+             for digitstr, moves in solutions.items()])
+        self.stored += len(solutions)
+        self.evict()
+        self.connection.commit()
+
+    def evict(self):
+        """ removes the least recently used solutions until there are no more
+            than max_solutions
+        """
+        extra = len(self) - self.max_solutions
+        if extra > 0:
+            self.connection.execute(
+                'DELETE FROM solutions WHERE rowid IN ' +
+                '(SELECT rowid FROM solutions ORDER BY last_used LIMIT ?)', [extra])
+
+    def close(self):
+        """ closes the file
+        """
+        self.connection.close()
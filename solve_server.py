@@ -0,0 +1,398 @@
+import argparse
+import asyncio
+import concurrent.futures
+import json
+import math
+import multiprocessing
+import random
+import sys
+import time
+from eight_puzzle import *
+
+# the heuristic functions a request may name; a list of names is combined
+# with hmax
+HEURISTICS = {'h0': h0, 'h1': h1, 'h2': h2, 'h3': h3, 'hpdb': hpdb, 'hstar': hstar}
+
+# the algorithms a request may name
+ALGORITHMS = ['random', 'BFS', 'DFS', 'IDDFS', 'Greedy', 'A*', 'anytime', 'IDA*', 'oracle',
+              'BiBFS', 'sweep']
+
+def request_number(request, name, kind, default = None):
+    """ returns the input field of the request converted by kind, or the
+        default if it is missing or null, raising ValueError if it is not a
+        number of that kind
+        inputs:
+          * request - a dictionary read from one line of JSON
+          * name - the name of the field
+          * kind - int or float
+          * default - the value of a missing field
+    """
+    value = request.get(name)
+    if value == None:
+        return default
+    # leaves out true and false, lists and objects, which int and float
+    # either take or fail on with a TypeError
+    if type(value) not in [int, float, str]:
+        raise ValueError(f'{name} is not a number: {json.dumps(value)}')
+    try:
+        return kind(value)
+    # a number too large for an int, such as 1e400, is an OverflowError
+    except (ValueError, OverflowError):
+        raise ValueError(f'{name} is not a valid {kind.__name__}: {json.dumps(value)}')
+
+def parse_request(request):
+    """ returns a tuple of the task for solve_task and the key that identical
+        requests share, raising ValueError if the request is not valid
+        input request: a dictionary read from one line of JSON, with a
+        'board' digitstr and optionally 'algorithm' (by default 'A*'),
+        'heuristic' (a name or a list of names, by default 'h3' for the
+        algorithms that need one), 'depth_limit', 'graph_search' and the
+        limits of a Budget ('max_expansions', 'time_limit', 'max_frontier')
+    """
+    if type(request.get('board')) != str:
+        raise ValueError('a request needs a board digitstr')
+    algorithm = request.get('algorithm', 'A*')
+    if algorithm not in ALGORITHMS:
+        raise ValueError(f'unknown algorithm: {algorithm}')
+
+    heuristic = None
+    names = request.get('heuristic')
+    if names == None and algorithm in ['Greedy', 'A*', 'anytime', 'IDA*']:
+        names = 'h3'
+    if names != None:
+        if type(names) == str:
+            names = [names]
+        if type(names) != list or len(names) == 0:
+            raise ValueError('a heuristic is a name or a non-empty list of names')
+        for name in names:
+            if type(name) != str or name not in HEURISTICS:
+                raise ValueError(f'unknown heuristic: {json.dumps(name)}')
+        heuristic = HEURISTICS[names[0]]
+        if len(names) > 1:
+            heuristic = hmax(*[HEURISTICS[name] for name in names])
+
+    depth_limit = request_number(request, 'depth_limit', int, -1)
+    graph_search = bool(request.get('graph_search', False))
+    budget = None
+    for name in BUDGET_FIELDS:
+        value = request_number(request, name, BUDGET_FIELDS[name])
+        if value != None:
+            if budget == None:
+                budget = Budget()
+            setattr(budget, name, value)
+
+    # the digit string of the board, so every spelling of a board shares a
+    # key, raising AssertionError for a board that is not valid
+    try:
+        digitstr = PackedBoard(request['board']).digit_string()
+    except AssertionError:
+        raise ValueError(f'not a valid board: {request["board"]}')
+
+    limits = None
+    if budget != None:
+        limits = (budget.max_expansions, budget.time_limit, budget.max_frontier)
+    key = (digitstr, algorithm, heuristic_name(heuristic), depth_limit,
+           graph_search, limits)
+    task = (digitstr, algorithm, depth_limit, heuristic, PackedBoard,
+            graph_search, None, None, False, budget)
+    return task, key
+
+class SolveServer:
+    """ A class for an asyncio server that solves puzzles sent to it as
+        lines of JSON over TCP and answers each with a line of JSON. The
+        searches run in a pool of processes, identical requests that arrive
+        while one is being searched share its search, and a bounded queue
+        stops reading requests while it is full.
+    """
+    def __init__(self, workers = 2, max_queue = 64):
+        """ a constructor for a SolveServer object
+            inputs:
+              * workers - the number of processes that search in parallel
+              * max_queue - the most searches that may wait for a worker
+        """
+        self.workers = workers
+        self.max_queue = max_queue
+        self.pool = None
+        self.queue = None
+        # the future of the result of each search that is waiting or
+        # running, by the key of its request
+        self.inflight = {}
+        self.requests = 0
+        self.searches = 0
+        self.coalesced = 0
+        self.errors = 0
+
+    def counts(self):
+        """ returns a dictionary of the numbers of requests, searches,
+            requests that shared another's search and requests that were
+            not valid, and the searches waiting for a worker
+        """
+        return {'requests': self.requests, 'searches': self.searches,
+                'coalesced': self.coalesced, 'errors': self.errors,
+                'queued': self.queue.qsize(), 'inflight': len(self.inflight)}
+
+    async def submit(self, request):
+        """ returns a tuple of the answer to the input request if it needs
+            no search, or else None, the future of the result of its search
+            and True if the search was already waiting or running for an
+            identical request. A new search waits here while the queue is
+            full, so a client that sends too many requests is not read from
+            until the workers catch up.
+            input request: a dictionary read from one line of JSON
+        """
+        self.requests += 1
+        if request.get('op') == 'stats':
+            return self.counts(), None, False
+        try:
+            task, key = parse_request(request)
+        except ValueError as e:
+            self.errors += 1
+            return {'error': str(e)}, None, False
+
+        # answers an unsolvable board without a search
+        if not PackedBoard(task[0]).is_solvable():
+            return SolveResult(task[0], 'unsolvable').record(), None, False
+
+        if key in self.inflight:
+            self.coalesced += 1
+            return None, self.inflight[key], True
+        self.searches += 1
+        future = asyncio.get_running_loop().create_future()
+        self.inflight[key] = future
+        await self.queue.put((task, key, future))
+        return None, future, False
+
+    async def dispatch(self):
+        """ sends the searches in the queue to the pool, one at a time, for
+            as long as the server runs
+        """
+        loop = asyncio.get_running_loop()
+        while True:
+            task, key, future = await self.queue.get()
+            try:
+                result = await loop.run_in_executor(self.pool, solve_task, task)
+            # answers every request for the search with the error
+            except Exception as e:
+                result = e
+            del self.inflight[key]
+            future.set_result(result)
+
+    async def handle(self, reader, writer):
+        """ answers the requests of one connection, each as soon as it is
+            done, so the answers may come back in a different order than the
+            requests; an answer has the 'id' of its request
+            inputs:
+              * reader - the asyncio.StreamReader of the connection
+              * writer - the asyncio.StreamWriter of the connection
+        """
+        lock = asyncio.Lock()
+
+        async def send(request, response):
+            if 'id' in request:
+                response['id'] = request['id']
+            writer.write((json.dumps(response) + '\n').encode())
+            # one drain at a time, since the answers are written by
+            # different tasks
+            async with lock:
+                await writer.drain()
+
+        async def answer(request, future, coalesced):
+            # the future is shared by every identical request, so it is
+            # not cancelled with this one
+            result = await asyncio.shield(future)
+            if isinstance(result, Exception):
+                self.errors += 1
+                response = {'error': str(result)}
+            else:
+                response = result.record()
+                response['coalesced'] = coalesced
+            await send(request, response)
+
+        pending = set()
+        try:
+            while True:
+                line = await reader.readline()
+                if line == b'':
+                    break
+                if line.strip() == b'':
+                    continue
+                try:
+                    request = json.loads(line)
+                    if type(request) != dict:
+                        raise ValueError('a request is a JSON object')
+                except ValueError as e:
+                    self.errors += 1
+                    await send({}, {'error': str(e)})
+                    continue
+                response, future, coalesced = await self.submit(request)
+                if future == None:
+                    await send(request, response)
+                else:
+                    t = asyncio.create_task(answer(request, future, coalesced))
+                    pending.add(t)
+                    t.add_done_callback(pending.discard)
+            # answers the requests that are still being searched before
+            # closing
+            if len(pending) > 0:
+                await asyncio.gather(*pending, return_exceptions=True)
+        except ConnectionError:
+            for t in pending:
+                t.cancel()
+        # answers the requests that are still being searched and then
+        # reports the error, so that no answer is left without a reader
+        except Exception as e:
+            self.errors += 1
+            try:
+                if len(pending) > 0:
+                    await asyncio.gather(*pending, return_exceptions=True)
+                await send({}, {'error': f'closing the connection: {e}'})
+            except ConnectionError:
+                for t in pending:
+                    t.cancel()
+        finally:
+            writer.close()
+
+    async def serve(self, host = '127.0.0.1', port = 8765, ready = None):
+        """ runs the server until it is cancelled
+            inputs:
+              * host, port - the address to listen on
+              * ready - an optional asyncio.Event that is set once the
+                server is listening
+        """
+        self.queue = asyncio.Queue(self.max_queue)
+        # the workers are started as they are needed, after connections
+        # are open, so they are spawned instead of forked, since a forked
+        # worker would keep a copy of each open socket and a closed
+        # connection would never reach its client
+        self.pool = concurrent.futures.ProcessPoolExecutor(
+            self.workers, mp_context=multiprocessing.get_context('spawn'))
+        dispatchers = [asyncio.create_task(self.dispatch()) for i in range(self.workers)]
+        server = await asyncio.start_server(self.handle, host, port)
+        if ready != None:
+            ready.set()
+        try:
+            async with server:
+                await server.serve_forever()
+        finally:
+            for d in dispatchers:
+                d.cancel()
+            self.pool.shutdown(cancel_futures=True)
+
+def percentile(values, p):
+    """ returns the value below which the input percentage of the input
+        values fall, by the nearest-rank method
+        inputs:
+          * values - a non-empty sorted list of numbers
+          * p - a percentage from 0 to 100
+    """
+    rank = max(1, math.ceil(p / 100 * len(values)))
+    return values[rank - 1]
+
+async def run_load(host, port, requests, concurrency):
+    """ sends the input requests to a solve server over the input number of
+        connections, each sending its next request once the last one is
+        answered, and returns a tuple of the sorted list of the seconds each
+        request took, the seconds the whole load took and the list of
+        answers
+        inputs:
+          * host, port - the address of the server
+          * requests - a list of dictionaries to send as lines of JSON
+          * concurrency - the number of connections
+    """
+    latencies = []
+    answers = []
+    todo = iter(requests)
+
+    async def client():
+        reader, writer = await asyncio.open_connection(host, port)
+        for request in todo:
+            start = time.perf_counter()
+            writer.write((json.dumps(request) + '\n').encode())
+            await writer.drain()
+            answer = json.loads(await reader.readline())
+            latencies.append(time.perf_counter() - start)
+            answers.append(answer)
+        writer.close()
+        await writer.wait_closed()
+
+    start = time.perf_counter()
+    await asyncio.gather(*[client() for i in range(concurrency)])
+    seconds = time.perf_counter() - start
+    latencies.sort()
+    return latencies, seconds, answers
+
+def load(args = None):
+    """ sends a load of puzzles to a running solve server and prints the
+        latency percentiles and throughput
+        input args: a list of command-line arguments, by default the ones
+        after the command name
+    """
+    from benchmark import make_puzzles
+    parser = argparse.ArgumentParser(prog='python solve_server.py load')
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=8765)
+    parser.add_argument('--requests', type=int, default=500)
+    parser.add_argument('--concurrency', type=int, default=16, help='connections')
+    parser.add_argument('--moves', type=int, default=20,
+                        help='the optimal solution length of the puzzles')
+    parser.add_argument('--distinct', type=int, default=100,
+                        help='the number of different puzzles, which repeat')
+    parser.add_argument('--algorithm', default='A*')
+    parser.add_argument('--heuristic', default=None)
+    parser.add_argument('--seed', type=int, default=0)
+    if args == None:
+        args = sys.argv[2:]
+    options = parser.parse_args(args)
+
+    puzzles = make_puzzles(options.moves, options.distinct, options.seed)
+    rng = random.Random(options.seed)
+    requests = []
+    for i in range(options.requests):
+        request = {'id': i, 'board': rng.choice(puzzles), 'algorithm': options.algorithm}
+        if options.heuristic != None:
+            request['heuristic'] = options.heuristic.split(',')
+        requests += [request]
+
+    latencies, seconds, answers = asyncio.run(
+        run_load(options.host, options.port, requests, options.concurrency))
+    # every record has an 'error' field, which is null unless its line was invalid
+    errors = [answer for answer in answers if answer.get('error') != None]
+    coalesced = [answer for answer in answers if answer.get('coalesced')]
+    print(f'{len(answers)} requests over {options.concurrency} connections ' +
+          f'in {seconds:.2f} seconds: {len(answers) / seconds:.1f} requests/sec')
+    print(f'latency (ms): p50 {1000 * percentile(latencies, 50):.1f}, ' +
+          f'p90 {1000 * percentile(latencies, 90):.1f}, ' +
+          f'p99 {1000 * percentile(latencies, 99):.1f}, ' +
+          f'max {1000 * latencies[-1]:.1f}')
+    print(f'{len(coalesced)} answers shared another search, {len(errors)} errors')
+    if len(errors) > 0:
+        print('first error:', errors[0]['error'])
+
+def serve(args = None):
+    """ runs a solve server until it is interrupted
+        input args: a list of command-line arguments, by default the ones
+        after the command name
+    """
+    parser = argparse.ArgumentParser(prog='python solve_server.py serve')
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=8765)
+    parser.add_argument('--workers', type=int, default=2, help='search processes')
+    parser.add_argument('--max-queue', type=int, default=64,
+                        help='the most searches that may wait for a worker')
+    if args == None:
+        args = sys.argv[2:]
+    options = parser.parse_args(args)
+
+    server = SolveServer(options.workers, options.max_queue)
+    print(f'solving on {options.host}:{options.port} with {options.workers} workers')
+    try:
+        asyncio.run(server.serve(options.host, options.port))
+    except KeyboardInterrupt:
+        print('Server stopped.')
+
+if __name__ == '__main__':
+    commands = {'serve': serve, 'load': load}
+    if len(sys.argv) < 2 or sys.argv[1] not in commands:
+        print('usage: python solve_server.py', '|'.join(commands))
+    else:
+        commands[sys.argv[1]]()
@@ -1,6 +1,7 @@
 from board import *
 
-# a 2-D list that corresponds to the tiles in the goal state
+# a 2-D list that corresponds to the tiles in the goal state of the
+# Eight Puzzle (boards of other sizes get theirs from board.get_tables)
 GOAL_TILES = [[0, 1, 2],
               [3, 4, 5],
               [6, 7, 8]]
@@ -9,11 +10,25 @@ GOAL_TILES = [[0, 1, 2],
 # moving the blank cell in the specified direction
 MOVES = ['up', 'down', 'left', 'right']
 
+# the move that undoes each move
+INVERSE_MOVES = {'up': 'down', 'down': 'up', 'left': 'right', 'right': 'left'}
+
+# the name of each move code: the codes 0-3 are the indices of MOVES (as in
+# board.MOVE_CODES), and 4 is the move of a state with no predecessor
+MOVE_NAMES = MOVES + ['init']
+
+# the move code that undoes each move code
+INVERSE_CODES = [1, 0, 3, 2]
+
 class State:
     """ A class for objects that represent a state in the state-space 
         search tree of an Eight Puzzle.
     """
     ### Add your method definitions here. ###
+
+    # fixed attributes instead of a __dict__, since a search can keep
+    # millions of State objects
+    __slots__ = ('board', 'predecessor', 'move', 'num_moves')
     
     # function 1
     def __init__(self, board, predecessor, move):
@@ -21,10 +36,15 @@ class State:
             input board: a Board object
             input predecessor: the State object the current State was derived 
             from
-            input move: an appropriate direction string
+            input move: an appropriate direction string or 'init', or its
+            move code
         """
         self.board = board
         self.predecessor = predecessor
+        # stores the move as a small integer, whose name is only looked up
+        # when the state is printed
+        if type(move) == str:
+            move = MOVE_NAMES.index(move)
         self.move = move
         
         # if there are no predecessors, num_moves equals 0
@@ -40,7 +60,7 @@ class State:
         """
         # You should *NOT* change this method.
         s = self.board.digit_string() + '-'
-        s += self.move + '-'
+        s += MOVE_NAMES[self.move] + '-'
         s += str(self.num_moves)
         return s
     
@@ -71,8 +91,9 @@ class State:
     # function 2
     def is_goal(self):
         """ returns a boolean value if the current state is equal to the goal state"""
-        # tests if GOAL_TILES has the same tiles as self.board.tiles
-        return GOAL_TILES == self.board.tiles
+        # asks the board itself, so that each kind of board can use its
+        # cheapest goal test
+        return self.board.is_goal()
     
     # function 3
     def generate_successors(self):
@@ -80,8 +101,8 @@ class State:
         """
         # creates an empty list of successors
         successors = []
-        # parses through each direction from list MOVES
-        for m in MOVES:
+        # parses through the code of each direction from list MOVES
+        for m in range(len(MOVES)):
             # creates a deep copy of the board
             b = self.board.copy()
             # checks if the blank can move in the given direction, adding the
@@ -92,6 +113,30 @@ class State:
 
         return successors
     
+    def apply_moves(self, moves):
+        """ returns the State object reached by making the input moves from
+            this state, creating one State object per move
+            input moves: a list of direction strings or move codes
+        """
+        state = self
+        for m in moves:
+            b = state.board.copy()
+            b.move_blank(m)
+            state = State(b, state, m)
+        return state
+
+    def move_codes(self):
+        """ returns the list of move codes that lead from the initial state
+            to this state, which apply_moves takes back
+        """
+        codes = []
+        state = self
+        while state.predecessor != None:
+            codes += [state.move]
+            state = state.predecessor
+        codes.reverse()
+        return codes
+
     # function 7
     def print_moves_to(self):
         """ prints the sequence of moves from the intial state object to 
@@ -106,7 +151,7 @@ class State:
         # object, and prints out the board
         else:
             self.predecessor.print_moves_to()
-            print(f"move the blank {self.move}:")
+            print(f"move the blank {MOVE_NAMES[self.move]}:")
             print(self.board)
 
 if __name__ == "__main__":
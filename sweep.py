@@ -0,0 +1,129 @@
+from state import *
+from budget import *
+
+def sweep(boards, depth_limit = -1, budget = None):
+    """ walks breadth-first out from the goal until every input board has
+        been reached, and returns a tuple of the parents dictionary, a
+        dictionary that maps the packed integer of each board that was
+        reached to the number of boards tested before it was found, and the
+        BudgetExhausted exception that stopped the sweep early, or None
+        inputs:
+          * boards - a list of Board or PackedBoard objects of one size,
+            all of which can reach the goal
+          * depth_limit - the most moves from the goal to search, or -1
+          * budget - an optional Budget object that limits the sweep
+
+        parents maps the packed integer of every board found to the code of
+        the move that reached it from the goal side, or 4 for the goal, so
+        each board costs one small integer instead of a State object.
+    """
+    tables = boards[0].tables
+    targets = set([tables.pack(board.tile_list()) for board in boards])
+    shifts = tables.shifts
+    mask = tables.cell_mask
+    moves = [tables.move_targets[code] for code in range(len(MOVES))]
+
+    parents = {tables.goal_packed: MOVE_NAMES.index('init')}
+    found = {}
+    # the goal is counted when it is expanded, or as the one board tested
+    # if it is a target
+    num_tested = 0
+    if tables.goal_packed in targets:
+        found[tables.goal_packed] = 1
+        targets.remove(tables.goal_packed)
+
+    # each layer is a list of (packed integer, cell of the blank) pairs
+    layer = [(tables.goal_packed, 0)]
+    depth = 0
+    if budget != None:
+        budget.start()
+    try:
+        while len(targets) > 0 and len(layer) > 0:
+            if depth_limit != -1 and depth >= depth_limit:
+                break
+            depth += 1
+            next_layer = []
+            for packed, blank in layer:
+                num_tested += 1
+                if budget != None:
+                    budget.check(num_tested, len(parents))
+                for code in range(len(moves)):
+                    target = moves[code][blank]
+                    if target == -1:
+                        continue
+                    # moves the tile at target into the blank, as
+                    # PackedBoard.move_blank does
+                    tile = (packed >> shifts[target]) & mask
+                    new_packed = packed + (tile << shifts[blank]) - (tile << shifts[target])
+                    if new_packed in parents:
+                        continue
+                    parents[new_packed] = code
+                    next_layer += [(new_packed, target)]
+                    if new_packed in targets:
+                        found[new_packed] = num_tested
+                        targets.remove(new_packed)
+            layer = next_layer
+    # keeps the boards found so far when a limit runs out
+    except BudgetExhausted as exhausted:
+        return parents, found, exhausted
+
+    return parents, found, None
+
+def moves_to_goal(parents, board):
+    """ returns the list of move codes that take the input board to the goal
+        along the parents recorded by sweep, which is a shortest solution
+        inputs:
+          * parents - the parents dictionary returned by sweep
+          * board - a Board or PackedBoard object that the sweep reached
+    """
+    tables = board.tables
+    cells = board.tile_list()
+    packed = tables.pack(cells)
+    blank = cells.index(0)
+    init = MOVE_NAMES.index('init')
+    moves = []
+    code = parents[packed]
+    while code != init:
+        # undoes the move that reached this board from the goal side
+        m = INVERSE_CODES[code]
+        moves += [m]
+        target = tables.move_targets[m][blank]
+        tile = (packed >> tables.shifts[target]) & tables.cell_mask
+        packed += (tile << tables.shifts[blank]) - (tile << tables.shifts[target])
+        blank = target
+        code = parents[packed]
+    return moves
+
+def solve_all(digitstrs, board_class = PackedBoard, depth_limit = -1, budget = None):
+    """ returns a dictionary that maps each input digitstr to a list of the
+        status ('solved', 'no solution', or 'budget exhausted' followed by
+        the limit that ran out in parentheses), its number of moves (or
+        None), the number of boards the sweep tested before it found the
+        board (or in all), and its list of move codes (or None). The
+        digitstrs of each board size share one sweep.
+        inputs:
+          * digitstrs - a list of digitstrs that can all reach the goal
+          * board_class - the board representation to parse them with
+          * depth_limit - the most moves from the goal to search, or -1
+          * budget - an optional Budget object that limits each sweep
+    """
+    results = {}
+    boards = {}
+    for digitstr in digitstrs:
+        boards[digitstr] = board_class(digitstr)
+    for size in set([board.tables.size for board in boards.values()]):
+        group = [digitstr for digitstr in boards if boards[digitstr].tables.size == size]
+        parents, found, exhausted = sweep([boards[digitstr] for digitstr in group],
+                                          depth_limit, budget)
+        status = 'no solution'
+        if exhausted != None:
+            status = 'budget exhausted (' + exhausted.reason + ')'
+        for digitstr in group:
+            board = boards[digitstr]
+            packed = board.tables.pack(board.tile_list())
+            if packed in found:
+                moves = moves_to_goal(parents, board)
+                results[digitstr] = ['solved', len(moves), found[packed], moves]
+            else:
+                results[digitstr] = [status, None, len(parents), None]
+    return results
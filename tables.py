@@ -0,0 +1,39 @@
+import mmap
+import os
+
+# the directory that holds the precomputed tables
+TABLE_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'data')
+
+def table_path(name):
+    """ returns the path of the table file with the input name
+        input name: a file name inside TABLE_DIR
+    """
+    return os.path.join(TABLE_DIR, name)
+
+def save_table(name, table):
+    """ writes the input table of bytes to the file with the input name,
+        replacing the file in one step so readers never see half a table
+        inputs:
+          * name - a file name inside TABLE_DIR
+          * table - a bytes or bytearray object
+    """
+    os.makedirs(TABLE_DIR, exist_ok=True)
+    path = table_path(name)
+    tmp = path + '.tmp.' + str(os.getpid())
+    with open(tmp, 'wb') as f:
+        f.write(table)
+    os.replace(tmp, path)
+
+def load_table(name, build):
+    """ returns a read-only memory map of the table file with the input name,
+        calling build() and saving its result first if the file is missing.
+        Every process that maps the same file shares its pages.
+        inputs:
+          * name - a file name inside TABLE_DIR
+          * build - a function that returns the table as a bytearray
+    """
+    path = table_path(name)
+    if not os.path.exists(path):
+        save_table(name, build())
+    with open(path, 'rb') as f:
+        return mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
@@ -12,11 +12,11 @@ class Timer:
         self.end_time = None
 
     def start(self):
-        self.start_time = time.time()
+        self.start_time = time.perf_counter()
         self.end_time = None
 
     def end(self):
-        self.end_time = time.time()
+        self.end_time = time.perf_counter()
 
     def get_diff(self):
         if self.start_time != None and self.end_time != None: